@@ -0,0 +1,115 @@
+import os, socket, time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from bookingservice.services.event_service import (
+    event_cache_key,
+    event_client,
+    missing_event_key,
+)
+from bookingservice.views import seed_inventory
+from utils.redis import EVENT_CHANGES_STREAM, redis_client, ticket_types_key
+
+
+class Command(BaseCommand):
+    help = (
+        "Consume event and ticket type changes published by the event service "
+        "and keep the cached event data and inventory up to date"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--group",
+            default="bookingservice",
+            help="Consumer group; each group receives every message once",
+        )
+        parser.add_argument(
+            "--consumer",
+            default=f"{socket.gethostname()}-{os.getpid()}",
+            help="Name of this consumer within the group",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=100, help="Messages read per call"
+        )
+        parser.add_argument(
+            "--block",
+            type=int,
+            default=5000,
+            help="Milliseconds to wait for new messages per read",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the messages available now, then exit",
+        )
+
+    def handle(self, *args, **options):
+        group, consumer = options["group"], options["consumer"]
+        redis_client.stream_create_group(EVENT_CHANGES_STREAM, group)
+        self.stdout.write(f"Consuming {EVENT_CHANGES_STREAM} as {group}/{consumer}")
+
+        # Pick up messages left unacknowledged by consumers that went away
+        self.process(
+            group,
+            redis_client.stream_claim(
+                EVENT_CHANGES_STREAM, group, consumer, count=options["batch_size"]
+            ),
+        )
+
+        while True:
+            messages = redis_client.stream_read(
+                EVENT_CHANGES_STREAM,
+                group,
+                consumer,
+                count=options["batch_size"],
+                block=None if options["once"] else options["block"],
+            )
+            self.process(group, messages)
+            if options["once"] and not messages:
+                return
+            if not messages and redis_client.breaker.state != "closed":
+                # Redis is down; reads fail immediately, so do not spin
+                time.sleep(1)
+
+    def process(self, group, messages):
+        processed = []
+        for message_id, message in messages:
+            try:
+                self.apply(message)
+            except Exception as e:
+                # Left pending, so it is retried once claimed again
+                self.stderr.write(f"Failed to apply {message_id}: {e}")
+                continue
+            processed.append(message_id)
+
+        if processed:
+            redis_client.stream_ack(EVENT_CHANGES_STREAM, group, *processed)
+            self.stdout.write(f"Applied {len(processed)} changes")
+
+    def apply(self, message):
+        entity, action = message.get("entity"), message.get("action")
+        event_id, data = message.get("event_id"), message.get("data")
+        key = event_cache_key(event_id)
+
+        if entity == "event":
+            if action == "deleted":
+                redis_client.delete_event_snapshot(key)
+                redis_client.delete_inventory(event_id)
+                event_client.mark_event_missing(event_id)
+                return
+            if action == "created":
+                redis_client.cache_delete(missing_event_key(event_id))
+            # Only the status moved; leave the rest of the snapshot alone
+            if action != "status_changed" or not redis_client.update_event_fields(
+                key, {"status": data["status"], "updated_at": data["updated_at"]}
+            ):
+                redis_client.set_event_snapshot(
+                    key, data, getattr(settings, "EVENT_CACHE_TTL", 300)
+                )
+            seed_inventory(event_id, data.get("ticket_types", []))
+
+        elif entity == "ticket_type":
+            if action == "deleted":
+                redis_client.hdel(ticket_types_key(key), str(message.get("id")))
+                return
+            redis_client.update_event_ticket_types(key, {data["id"]: data})
+            seed_inventory(event_id, [data])
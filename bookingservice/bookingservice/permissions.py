@@ -0,0 +1,12 @@
+from rest_framework.permissions import BasePermission
+from utils.checks import is_internal_request
+
+
+class IsInternalRequest(BasePermission):
+    """
+    Allows access only to internal requests.
+    """
+
+    def has_permission(self, request, _):
+        # Check if the request is from an internal service
+        return is_internal_request(request)
@@ -1,20 +1,314 @@
-import requests, logging
+import requests, json, logging, os, threading, time
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
-from typing import Optional, List, Dict, Any, Union
-from datetime import datetime
+from typing import Optional, Callable, List, Dict, Any, Iterator, Tuple, Union
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.local_cache import LocalCache
+from utils.redis import EVENT_IDS_FILTER, event_key, redis_client
 
 logger = logging.getLogger(__name__)
 
 
+def event_cache_key(event_id: Any) -> str:
+    """
+    Snapshot hash of event data (see RedisClient.set_event_snapshot), kept
+    up to date from the event changes stream by consume_event_changes
+    """
+    return event_key(event_id)
+
+
+def missing_event_key(event_id: Any) -> str:
+    """Negative cache entry for an event id the event service does not know"""
+    return f"event_service:missing:{event_id}"
+
+
+class EventServiceError(Exception):
+    """A request to the event service failed where None cannot be returned"""
+
+
+# Returned by _make_request instead of None when the resource does not exist
+NOT_FOUND = {"success": False, "not_found": True}
+
+
+def response_cache_key(url: str, params: Optional[Dict] = None) -> str:
+    """Key of a GET response in the client response cache"""
+    if not params:
+        return url
+    return f"{url}?{json.dumps(params, sort_keys=True, default=str)}"
+
+
+def build_response_cache() -> LocalCache:
+    """
+    In-process cache of (ETag, body) of event service responses, which are
+    revalidated with If-None-Match on every use rather than trusted
+    """
+    return LocalCache(
+        max_size=getattr(settings, "EVENT_SERVICE_RESPONSE_CACHE_SIZE", 1024),
+        ttl=getattr(settings, "EVENT_SERVICE_RESPONSE_CACHE_TTL", 600),
+    )
+
+
+# Status updates sent per bulk request by batch_update_status
+BULK_STATUS_CHUNK_SIZE = 100
+
+
+def split_status_updates(
+    event_updates: List[Dict[str, Any]], chunk_size: int
+) -> Tuple[Dict[str, List[Any]], List[List[Dict[str, Any]]]]:
+    """
+    Results with the invalid updates already failed, and the valid ones
+    in chunks of chunk_size for the bulk status endpoint. Event ids are sent
+    as ints, since bookings store them as strings.
+    """
+    results = {"successful": [], "failed": []}
+    valid = []
+    for update in event_updates:
+        try:
+            event_id = int(update.get("event_id"))
+        except (TypeError, ValueError):
+            event_id = None
+        if not event_id or not update.get("status"):
+            logger.warning(f"Invalid update data: {update}")
+            results["failed"].append(update.get("event_id"))
+        else:
+            valid.append({"event_id": event_id, "status": update["status"]})
+    chunks = [valid[i : i + chunk_size] for i in range(0, len(valid), chunk_size)]
+    return results, chunks
+
+
+def merge_status_results(
+    results: Dict[str, List[Any]],
+    chunk: List[Dict[str, Any]],
+    response: Optional[Dict],
+):
+    """Add the outcome of one bulk status request to results"""
+    if response is None:
+        results["failed"].extend(update["event_id"] for update in chunk)
+        return
+    for outcome in response.get("results", []):
+        if not outcome.get("success"):
+            logger.warning(
+                f"Status update of event {outcome.get('event_id')} failed: "
+                f"{outcome.get('error')}"
+            )
+        results["successful" if outcome.get("success") else "failed"].append(
+            outcome.get("event_id")
+        )
+
+
+class ClientMetrics:
+    """Thread-safe request, error, status and retry counters of an HTTP client"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.errors = 0
+            self.retries = 0
+            self.total_seconds = 0.0
+            self.statuses: Dict[int, int] = {}
+            self.revalidations = {"not_modified": 0, "modified": 0}
+
+    def record_request(self, seconds: float, status_code: Optional[int]):
+        """Count a finished call, with status None when it raised"""
+        with self._lock:
+            self.requests += 1
+            self.total_seconds += seconds
+            if status_code is None:
+                self.errors += 1
+            else:
+                self.statuses[status_code] = self.statuses.get(status_code, 0) + 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_revalidation(self, not_modified: bool):
+        """Count a conditional GET answered with a 304 or a full 200"""
+        with self._lock:
+            self.revalidations["not_modified" if not_modified else "modified"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "retries": self.retries,
+                "avg_seconds": (
+                    self.total_seconds / self.requests if self.requests else 0.0
+                ),
+                "statuses": dict(self.statuses),
+                "revalidations": dict(self.revalidations),
+            }
+
+    def render_prometheus(self, prefix: str = "event_service_client") -> str:
+        """The counters in the Prometheus text exposition format"""
+        with self._lock:
+            counters = [
+                ("requests_total", "counter", [("", self.requests)]),
+                ("errors_total", "counter", [("", self.errors)]),
+                ("retries_total", "counter", [("", self.retries)]),
+                ("request_seconds_total", "counter", [("", self.total_seconds)]),
+                (
+                    "responses_total",
+                    "counter",
+                    [
+                        (f'status="{code}"', n)
+                        for code, n in sorted(self.statuses.items())
+                    ],
+                ),
+                (
+                    "revalidations_total",
+                    "counter",
+                    [
+                        (f'result="{result}"', n)
+                        for result, n in sorted(self.revalidations.items())
+                    ],
+                ),
+            ]
+        lines: List[str] = []
+        for name, kind, samples in counters:
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                labels = f"{{{labels}}}" if labels else ""
+                lines.append(f"{prefix}_{name}{labels} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class MeteredRetry(Retry):
+    """urllib3 retry policy that counts every retry it allows in metrics"""
+
+    metrics: Optional[ClientMetrics] = None
+
+    def new(self, **kw) -> "MeteredRetry":
+        retry = super().new(**kw)
+        retry.metrics = self.metrics
+        return retry
+
+    def increment(self, *args, **kwargs) -> "MeteredRetry":
+        # Raises MaxRetryError instead once the retries are used up
+        retry = super().increment(*args, **kwargs)
+        if self.metrics is not None:
+            self.metrics.record_retry()
+        return retry
+
+
 class EventServiceClient:
-    """Client for communicating with Event Service internal APIs"""
+    """
+    Client for communicating with Event Service internal APIs
+
+    Requests go through a requests.Session per process, so connections are
+    kept alive and reused. GETs that fail to connect, time out reading or
+    get a 502/503/504 are retried a few times with jittered exponential
+    backoff; other methods are only retried when they could not connect.
+
+    Responses of GETs made with revalidate=True are kept with their ETag
+    and asked for again with If-None-Match, so an unchanged resource
+    comes back as an empty 304 and is answered from the local copy.
+    """
 
     def __init__(self):
         self.base_url = settings.SERVICE_URLS.get(
             "EVENT_SERVICE_URL", "http://localhost:8001"
         )
         self.internal_prefix = getattr(settings, "INTERNAL_API_PREFIX", "internal/v1/")
-        self.timeout = 30  # seconds
+        self.timeout = (
+            getattr(settings, "EVENT_SERVICE_CONNECT_TIMEOUT", 3.05),
+            getattr(settings, "EVENT_SERVICE_READ_TIMEOUT", 10),
+        )
+        self.metrics = ClientMetrics()
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._pid: Optional[int] = None
+        self.responses = build_response_cache()
+
+    @property
+    def session(self) -> requests.Session:
+        """Pooled session of the current process, created on first use"""
+        pid = os.getpid()
+        if self._session is None or self._pid != pid:
+            with self._lock:
+                if self._session is None or self._pid != pid:
+                    self._session = self._build_session()
+                    if self._pid is not None:
+                        # Forked: do not share a lock held by another process
+                        self.responses = build_response_cache()
+                    self._pid = pid
+        return self._session
+
+    def _build_session(self) -> requests.Session:
+        retries = getattr(settings, "EVENT_SERVICE_RETRIES", 2)
+        retry = MeteredRetry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            other=0,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            status_forcelist=(502, 503, 504),
+            backoff_factor=getattr(settings, "EVENT_SERVICE_BACKOFF", 0.2),
+            backoff_jitter=getattr(settings, "EVENT_SERVICE_BACKOFF", 0.2),
+            backoff_max=5,
+            raise_on_status=False,
+        )
+        retry.metrics = self.metrics
+        pool_size = getattr(settings, "EVENT_SERVICE_POOL_SIZE", 10)
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(
+            {
+                "Content-Type": "application/json",
+                "User-Agent": "EventServiceClient/1.0",
+            }
+        )
+        return session
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Request, retry and revalidation counters plus connection pool and
+        response cache usage of this process
+        """
+        pools = {}
+        if self._session is not None and self._pid == os.getpid():
+            pool_manager = self._session.get_adapter(self.base_url).poolmanager
+            for key in pool_manager.pools.keys():
+                pool = pool_manager.pools[key]
+                pools[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                    "connections_opened": pool.num_connections,
+                    "requests": pool.num_requests,
+                    "maxsize": pool.pool.maxsize if pool.pool else 0,
+                }
+        return {
+            **self.metrics.snapshot(),
+            "pools": pools,
+            "response_cache": self.responses.stats(),
+        }
+
+    def event_may_exist(self, event_id: Any) -> bool:
+        """
+        False when event_id is known not to exist: it was recently confirmed
+        missing, or it is not in the Bloom filter of event ids maintained by
+        the event service. True otherwise, including when Redis cannot tell.
+        """
+        if redis_client.cache_get(missing_event_key(event_id)) is not None:
+            return False
+        return redis_client.bloom_contains(EVENT_IDS_FILTER, event_id) is not False
+
+    def mark_event_missing(self, event_id: Any):
+        """Remember for a short while that event_id does not exist"""
+        redis_client.cache_set(
+            missing_event_key(event_id),
+            True,
+            getattr(settings, "EVENT_MISSING_CACHE_TTL", 30),
+        )
 
     def _make_request(
         self,
@@ -22,32 +316,56 @@ class EventServiceClient:
         endpoint: str,
         data: Optional[Dict] = None,
         params: Optional[Dict] = None,
+        not_found: Optional[Dict] = None,
+        revalidate: bool = False,
     ) -> Optional[Dict]:
-        """Make HTTP request to event service"""
-        url = f"{self.base_url}/{self.internal_prefix.strip('/')}/{endpoint.strip('/')}"
+        """
+        Make HTTP request to event service. A 404 returns not_found, so
+        callers can tell a missing resource from a failed request.
 
+        With revalidate, a GET is sent with the ETag of the locally cached
+        response, if any, and a 304 returns the cached body.
+        """
+        url = (
+            f"{self.base_url}/{self.internal_prefix.strip('/')}/{endpoint.lstrip('/')}"
+        )
+        session = self.session
+        cache_key = response_cache_key(url, params) if revalidate else None
+        found, cached = self.responses.get(cache_key) if cache_key else (False, None)
+
+        started = time.monotonic()
+        status_code = None
         try:
-            response = requests.request(
+            response = session.request(
                 method=method,
                 url=url,
                 json=data,
                 params=params,
+                headers={"If-None-Match": cached[0]} if found else None,
                 timeout=self.timeout,
-                headers={
-                    "Content-Type": "application/json",
-                    "User-Agent": "EventServiceClient/1.0",
-                },
             )
+            status_code = response.status_code
 
             logger.info(
                 f"Event service request: {method} {url} - Status: {response.status_code}"
             )
 
-            if response.status_code == 200:
+            if response.status_code == 304 and found:
+                self.metrics.record_revalidation(not_modified=True)
+                return json.loads(cached[1])
+            elif response.status_code == 200:
+                if cache_key:
+                    if found:
+                        self.metrics.record_revalidation(not_modified=False)
+                    etag = response.headers.get("ETag")
+                    if etag:
+                        self.responses.set(cache_key, (etag, response.content))
                 return response.json()
             elif response.status_code == 404:
                 logger.warning(f"Event service resource not found: {url}")
-                return None
+                if found:
+                    self.responses.delete(cache_key)
+                return not_found
             else:
                 logger.error(
                     f"Event service error: {response.status_code} - {response.text}"
@@ -66,79 +384,144 @@ class EventServiceClient:
         except Exception as e:
             logger.error(f"Unexpected error calling event service: {str(e)}")
             return None
+        finally:
+            self.metrics.record_request(time.monotonic() - started, status_code)
 
-    def get_event(self, event_id: int) -> Optional[Dict]:
+    def get_event(
+        self, event_id: int, fields: Optional[List[str]] = None
+    ) -> Optional[Dict]:
         """
         Get single event by ID
 
         Args:
             event_id (int): The event ID to fetch
+            fields (Optional[List[str]]): Only these fields ("ticket_types"
+                included); read from the cached snapshot without decoding the
+                rest of the event
 
         Returns:
             Optional[Dict]: Event data or None if not found/error
         """
+        cached = self.cached_event(event_id, fields)
+        if cached is NOT_FOUND:
+            return None
+        if cached is not None:
+            return cached
+
         logger.info(f"Fetching event with ID: {event_id}")
-        result = self._make_request("GET", f"events/{event_id}/")
+        result = self._make_request(
+            "GET", f"events/{event_id}/", not_found=NOT_FOUND, revalidate=True
+        )
+        return self.event_from_result(event_id, result, fields)
+
+    def cached_event(
+        self, event_id: Any, fields: Optional[List[str]] = None
+    ) -> Optional[Dict]:
+        """
+        What get_event can answer without calling the event service: the
+        cached event (or its fields), NOT_FOUND if the event is known not to
+        exist, or None when it has to be fetched
+        """
+        if fields:
+            scalar = [field for field in fields if field != "ticket_types"]
+            cached = redis_client.get_event_fields(
+                event_cache_key(event_id), scalar, "ticket_types" in fields
+            )
+        else:
+            cached = redis_client.get_event_snapshot(event_cache_key(event_id))
+        if cached is not None:
+            return cached
+
+        if not self.event_may_exist(event_id):
+            logger.info(f"Skipping lookup of unknown event ID: {event_id}")
+            return NOT_FOUND
+        return None
 
+    def event_from_result(
+        self, event_id: Any, result: Optional[Dict], fields: Optional[List[str]] = None
+    ) -> Optional[Dict]:
+        """Event data out of a get-event response, remembering confirmed misses"""
         if result and result.get("success"):
-            return result.get("data")
+            data = result.get("data")
+            if fields and data:
+                return {field: data[field] for field in fields if field in data}
+            return data
+        if result is NOT_FOUND:
+            self.mark_event_missing(event_id)
         return None
 
-    def get_user_events(
-        self,
-        user_id: int,
-        page: int = 1,
-        limit: int = 20,
-        status: Optional[str] = None,
-        start_date: Optional[str] = None,
-        end_date: Optional[str] = None,
+    def get_organization_events(
+        self, organization_id: int, cursor: str = "", limit: int = 100
     ) -> Optional[Dict]:
         """
-        Get all events for a specific user
+        Get one page of an organization's events, newest first
 
         Args:
-            user_id (int): User ID to fetch events for
-            page (int): Page number for pagination (default: 1)
-            limit (int): Number of events per page (default: 20)
-            status (Optional[str]): Filter by event status
-            start_date (Optional[str]): Filter events from this date (YYYY-MM-DD)
-            end_date (Optional[str]): Filter events until this date (YYYY-MM-DD)
+            organization_id (int): Remote ID of the organization
+            cursor (str): "" for the first page, then the previous page's
+                next_cursor
+            limit (int): Number of events per page (default: 100)
 
         Returns:
             Optional[Dict]: Response with events data and pagination info
         """
-        logger.info(f"Fetching events for user ID: {user_id}")
-
-        params = {"page": page, "limit": limit}
-
-        if status:
-            params["status"] = status
-        if start_date:
-            params["start_date"] = start_date
-        if end_date:
-            params["end_date"] = end_date
+        logger.info(f"Fetching events for organization ID: {organization_id}")
 
-        result = self._make_request("GET", f"users/{user_id}/events/", params=params)
+        result = self._make_request(
+            "GET",
+            f"organizations/{organization_id}/events/",
+            params={"cursor": cursor, "limit": limit},
+        )
 
         if result and result.get("success"):
             return result
         return None
 
-    def get_user_events_list(self, user_id: int, **kwargs) -> List[Dict]:
+    def _iter_pages(
+        self, fetch_page: Callable[[str], Optional[Dict]], prefetch: bool = True
+    ) -> Iterator[Dict]:
         """
-        Get user events as a simple list (convenience method)
+        Stream events from fetch_page(cursor) page by page, following
+        next_cursor. With prefetch, the next page is requested in the
+        background while the caller works through the current one.
 
-        Args:
-            user_id (int): User ID to fetch events for
-            **kwargs: Additional parameters passed to get_user_events
-
-        Returns:
-            List[Dict]: List of events or empty list if error
+        Raises EventServiceError when a page cannot be fetched, so a failed
+        or cut-short stream is never mistaken for a complete one.
         """
-        result = self.get_user_events(user_id, **kwargs)
-        if result and "data" in result:
-            return result["data"]
-        return []
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            result = fetch_page("")
+            while True:
+                if not result:
+                    raise EventServiceError("Event service page request failed")
+                pagination = result.get("pagination", {})
+                next_cursor = pagination.get("has_next") and pagination.get(
+                    "next_cursor"
+                )
+                pending = None
+                if executor is not None and next_cursor:
+                    pending = executor.submit(fetch_page, next_cursor)
+                yield from result.get("data", [])
+                if not next_cursor:
+                    return
+                result = pending.result() if pending else fetch_page(next_cursor)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_organization_events(
+        self, organization_id: int, page_size: int = 100, prefetch: bool = True
+    ) -> Iterator[Dict]:
+        """
+        All events of an organization, streamed with keyset pagination, one
+        page in memory at a time (two with prefetch)
+        """
+        return self._iter_pages(
+            lambda cursor: self.get_organization_events(
+                organization_id, cursor=cursor, limit=page_size
+            ),
+            prefetch,
+        )
 
     def get_bulk_events(self, event_ids: List[int]) -> Optional[List[Dict]]:
         """
@@ -154,6 +537,12 @@ class EventServiceClient:
             logger.warning("Empty event_ids list provided to get_bulk_events")
             return []
 
+        event_ids = [
+            event_id for event_id in event_ids if self.event_may_exist(event_id)
+        ]
+        if not event_ids:
+            return []
+
         logger.info(
             f"Fetching bulk events for IDs: {event_ids[:10]}..."
         )  # Log first 10 IDs
@@ -241,36 +630,43 @@ class EventServiceClient:
 
         return success
 
+    def bulk_update_status(self, updates: List[Dict[str, Any]]) -> Optional[Dict]:
+        """
+        Update the status of several events in one request
+
+        Args:
+            updates (List[Dict]): Dicts with 'event_id' and 'status'
+
+        Returns:
+            Optional[Dict]: Response with per-event 'results', or None if error
+        """
+        result = self._make_request(
+            "PUT", "events/status/bulk/", data={"updates": updates}
+        )
+        if result and result.get("success"):
+            return result
+        return None
+
     def batch_update_status(
-        self, event_updates: List[Dict[str, Union[int, str]]]
+        self,
+        event_updates: List[Dict[str, Union[int, str]]],
+        chunk_size: int = BULK_STATUS_CHUNK_SIZE,
     ) -> Dict[str, List[int]]:
         """
-        Update multiple events' statuses in batch
+        Update multiple events' statuses in batch, chunk_size per request
 
         Args:
             event_updates (List[Dict]): List of dicts with 'event_id', 'status', and optional 'reason'
+            chunk_size (int): Updates sent per bulk request
 
         Returns:
             Dict[str, List[int]]: Results with 'successful' and 'failed' event IDs
         """
-        results = {"successful": [], "failed": []}
-
         logger.info(f"Batch updating {len(event_updates)} events")
 
-        for update in event_updates:
-            event_id = update.get("event_id")
-            status = update.get("status")
-            reason = update.get("reason")
-
-            if not event_id or not status:
-                logger.warning(f"Invalid update data: {update}")
-                results["failed"].append(event_id)
-                continue
-
-            if self.update_event_status(event_id, status, reason):
-                results["successful"].append(event_id)
-            else:
-                results["failed"].append(event_id)
+        results, chunks = split_status_updates(event_updates, chunk_size)
+        for chunk in chunks:
+            merge_status_results(results, chunk, self.bulk_update_status(chunk))
 
         logger.info(
             f"Batch update completed: {len(results['successful'])} successful, "
@@ -292,12 +688,6 @@ class EventServiceClient:
             "cancelled", start_date=start_date, end_date=end_date
         )
 
-    def get_upcoming_user_events(self, user_id: int) -> List[Dict]:
-        """Get upcoming events for a user"""
-        today = datetime.now().strftime("%Y-%m-%d")
-        result = self.get_user_events(user_id, start_date=today, status="active")
-        return result.get("data", []) if result else []
-
     def cancel_event(self, event_id: int, reason: str = "Cancelled by system") -> bool:
         """Cancel an event"""
         return self.update_event_status(event_id, "cancelled", reason)
@@ -334,35 +724,12 @@ class EventServiceHelper:
         event = self.client.get_event(event_id)
         return event if event is not None else default
 
-    def get_user_event_count(self, user_id: int) -> int:
-        """Get total count of user events"""
-        result = self.client.get_user_events(user_id, limit=1)
-        if result and "pagination" in result:
-            return result["pagination"].get("total", 0)
-        return 0
-
-    def get_all_user_events(self, user_id: int, **filters) -> List[Dict]:
-        """Get all events for a user across all pages"""
-        all_events = []
-        page = 1
-
-        while True:
-            result = self.client.get_user_events(
-                user_id, page=page, limit=100, **filters
-            )
-
-            if not result or not result.get("data"):
-                break
-
-            all_events.extend(result["data"])
-
-            pagination = result.get("pagination", {})
-            if not pagination.get("has_next", False):
-                break
-
-            page += 1
-
-        return all_events
+    def get_all_organization_events(self, organization_id: int) -> List[Dict]:
+        """
+        Get all events of an organization across all pages, raising
+        EventServiceError if any page cannot be fetched
+        """
+        return list(self.client.iter_organization_events(organization_id))
 
     def get_events_by_date_range(
         self, start_date: str, end_date: str, status: str = "active"
@@ -0,0 +1,516 @@
+import asyncio, httpx, json, logging, os, random, time, weakref
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
+from .event_service import (
+    BULK_STATUS_CHUNK_SIZE,
+    NOT_FOUND,
+    ClientMetrics,
+    EventServiceError,
+    build_response_cache,
+    event_client,
+    merge_status_results,
+    response_cache_key,
+    split_status_updates,
+)
+
+logger = logging.getLogger(__name__)
+
+# Methods safe to send again after the request may have reached the server
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+async def gather_limited(
+    awaitables: Iterable[Awaitable], limit: Optional[int] = None
+) -> List[Any]:
+    """
+    asyncio.gather that runs at most limit awaitables at a time (the event
+    service pool size by default), returning results in the order given
+    """
+    limit = limit or getattr(settings, "EVENT_SERVICE_POOL_SIZE", 10)
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(awaitable: Awaitable) -> Any:
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*(run(awaitable) for awaitable in awaitables))
+
+
+def _offload(func):
+    """Run a blocking helper (Redis lookups) in a worker thread"""
+    return sync_to_async(func, thread_sensitive=False)
+
+
+class AsyncEventServiceClient:
+    """
+    asyncio counterpart of EventServiceClient for async views and jobs
+
+    Method names, arguments, caching and return values match
+    EventServiceClient, with the same timeouts, pool size, retry policy and
+    response cache settings. httpx connections are bound to the event loop that opened
+    them, so one client is created lazily per running loop in each process.
+    """
+
+    def __init__(self):
+        self.base_url = settings.SERVICE_URLS.get(
+            "EVENT_SERVICE_URL", "http://localhost:8001"
+        )
+        self.internal_prefix = getattr(settings, "INTERNAL_API_PREFIX", "internal/v1/")
+        self.timeout = httpx.Timeout(
+            getattr(settings, "EVENT_SERVICE_READ_TIMEOUT", 10),
+            connect=getattr(settings, "EVENT_SERVICE_CONNECT_TIMEOUT", 3.05),
+        )
+        self.retries = getattr(settings, "EVENT_SERVICE_RETRIES", 2)
+        self.backoff = getattr(settings, "EVENT_SERVICE_BACKOFF", 0.2)
+        self.metrics = ClientMetrics()
+        self.responses = build_response_cache()
+        self._clients: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]"
+        ) = weakref.WeakKeyDictionary()
+        self._pid: Optional[int] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client for the running event loop, created on first use"""
+        pid = os.getpid()
+        if self._pid != pid:
+            self._clients = weakref.WeakKeyDictionary()
+            if self._pid is not None:
+                self.responses = build_response_cache()
+            self._pid = pid
+
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            pool_size = getattr(settings, "EVENT_SERVICE_POOL_SIZE", 10)
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=pool_size, max_keepalive_connections=pool_size
+                ),
+                headers={
+                    "Content-Type": "application/json",
+                    "User-Agent": "EventServiceClient/1.0",
+                },
+            )
+            self._clients[loop] = client
+        return client
+
+    async def close(self):
+        """Close the client of the running event loop"""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """Request, retry and revalidation counters of this process"""
+        return {
+            **self.metrics.snapshot(),
+            "clients": len(self._clients),
+            "response_cache": self.responses.stats(),
+        }
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter before retry number attempt + 1"""
+        return min(self.backoff * 2**attempt + random.uniform(0, self.backoff), 5)
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+    ) -> httpx.Response:
+        """
+        Send a request, retrying like EventServiceClient: connection failures
+        for any method, read timeouts and 502/503/504 for GETs only
+        """
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.request(
+                    method, url, json=data, params=params, headers=headers
+                )
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                # Never reached the server, so any method can be resent
+                if attempt >= self.retries:
+                    raise
+            except httpx.TransportError:
+                if method not in IDEMPOTENT_METHODS or attempt >= self.retries:
+                    raise
+            else:
+                if (
+                    response.status_code not in RETRY_STATUSES
+                    or method not in IDEMPOTENT_METHODS
+                    or attempt >= self.retries
+                ):
+                    return response
+            self.metrics.record_retry()
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None,
+        not_found: Optional[Dict] = None,
+        revalidate: bool = False,
+    ) -> Optional[Dict]:
+        """
+        Make HTTP request to event service. A 404 returns not_found, so
+        callers can tell a missing resource from a failed request. See
+        EventServiceClient._make_request for revalidate.
+        """
+        url = (
+            f"{self.base_url}/{self.internal_prefix.strip('/')}/{endpoint.lstrip('/')}"
+        )
+        cache_key = response_cache_key(url, params) if revalidate else None
+        found, cached = self.responses.get(cache_key) if cache_key else (False, None)
+
+        started = time.monotonic()
+        status_code = None
+        try:
+            response = await self._send(
+                method,
+                url,
+                data,
+                params,
+                headers={"If-None-Match": cached[0]} if found else None,
+            )
+            status_code = response.status_code
+
+            logger.info(
+                f"Event service request: {method} {url} - Status: {response.status_code}"
+            )
+
+            if response.status_code == 304 and found:
+                self.metrics.record_revalidation(not_modified=True)
+                return json.loads(cached[1])
+            elif response.status_code == 200:
+                if cache_key:
+                    if found:
+                        self.metrics.record_revalidation(not_modified=False)
+                    etag = response.headers.get("ETag")
+                    if etag:
+                        self.responses.set(cache_key, (etag, response.content))
+                return response.json()
+            elif response.status_code == 404:
+                logger.warning(f"Event service resource not found: {url}")
+                if found:
+                    self.responses.delete(cache_key)
+                return not_found
+            else:
+                logger.error(
+                    f"Event service error: {response.status_code} - {response.text}"
+                )
+                return None
+
+        except httpx.TimeoutException:
+            logger.error(f"Timeout calling event service: {url}")
+            return None
+        except httpx.TransportError:
+            logger.error(f"Connection error calling event service: {url}")
+            return None
+        except httpx.HTTPError as e:
+            logger.error(f"Request error calling event service: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error calling event service: {str(e)}")
+            return None
+        finally:
+            self.metrics.record_request(time.monotonic() - started, status_code)
+
+    async def get_event(
+        self, event_id: int, fields: Optional[List[str]] = None
+    ) -> Optional[Dict]:
+        """Get single event by ID, see EventServiceClient.get_event"""
+        cached = await _offload(event_client.cached_event)(event_id, fields)
+        if cached is NOT_FOUND:
+            return None
+        if cached is not None:
+            return cached
+
+        logger.info(f"Fetching event with ID: {event_id}")
+        result = await self._make_request(
+            "GET", f"events/{event_id}/", not_found=NOT_FOUND, revalidate=True
+        )
+        if result is NOT_FOUND:
+            await _offload(event_client.mark_event_missing)(event_id)
+            return None
+        return event_client.event_from_result(event_id, result, fields)
+
+    async def get_events(
+        self,
+        event_ids: List[int],
+        fields: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[int, Optional[Dict]]:
+        """
+        Get several events by ID concurrently, at most limit requests at a
+        time, as event ID -> event data (None if not found/error)
+        """
+        events = await gather_limited(
+            (self.get_event(event_id, fields) for event_id in event_ids), limit
+        )
+        return dict(zip(event_ids, events))
+
+    async def get_organization_events(
+        self, organization_id: int, cursor: str = "", limit: int = 100
+    ) -> Optional[Dict]:
+        """Get one page of an organization's events, newest first"""
+        logger.info(f"Fetching events for organization ID: {organization_id}")
+
+        result = await self._make_request(
+            "GET",
+            f"organizations/{organization_id}/events/",
+            params={"cursor": cursor, "limit": limit},
+        )
+
+        if result and result.get("success"):
+            return result
+        return None
+
+    async def _iter_pages(
+        self,
+        fetch_page: Callable[[str], Awaitable[Optional[Dict]]],
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream events from fetch_page(cursor) page by page, following
+        next_cursor, requesting the next page while the caller works through
+        the current one when prefetch is set. Raises EventServiceError when
+        a page cannot be fetched.
+        """
+        pending = None
+        try:
+            result = await fetch_page("")
+            while True:
+                if not result:
+                    raise EventServiceError("Event service page request failed")
+                pagination = result.get("pagination", {})
+                next_cursor = pagination.get("has_next") and pagination.get(
+                    "next_cursor"
+                )
+                if prefetch and next_cursor:
+                    pending = asyncio.create_task(fetch_page(next_cursor))
+                for event in result.get("data", []):
+                    yield event
+                if not next_cursor:
+                    return
+                if pending is not None:
+                    result, pending = await pending, None
+                else:
+                    result = await fetch_page(next_cursor)
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    def iter_organization_events(
+        self, organization_id: int, page_size: int = 100, prefetch: bool = True
+    ) -> AsyncIterator[Dict]:
+        """All events of an organization, streamed with keyset pagination"""
+        return self._iter_pages(
+            lambda cursor: self.get_organization_events(
+                organization_id, cursor=cursor, limit=page_size
+            ),
+            prefetch,
+        )
+
+    async def get_bulk_events(self, event_ids: List[int]) -> Optional[List[Dict]]:
+        """Get multiple events by their IDs in one request"""
+        if not event_ids:
+            logger.warning("Empty event_ids list provided to get_bulk_events")
+            return []
+
+        known = await _offload(
+            lambda: [
+                event_id
+                for event_id in event_ids
+                if event_client.event_may_exist(event_id)
+            ]
+        )()
+        if not known:
+            return []
+
+        result = await self._make_request(
+            "POST", "events/bulk/", data={"event_ids": known}
+        )
+
+        if result and result.get("success"):
+            found_count = result.get("found_count", 0)
+            requested_count = result.get("requested_count", len(known))
+            if found_count != requested_count:
+                logger.warning(
+                    f"Bulk events fetch: Found {found_count} out of {requested_count} requested events"
+                )
+            return result.get("data", [])
+        return None
+
+    async def get_events_by_status(
+        self,
+        status: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Optional[List[Dict]]:
+        """Get events by status with optional date filtering"""
+        logger.info(f"Fetching events with status: {status}")
+
+        params = {"status": status}
+
+        if start_date:
+            params["start_date"] = start_date
+        if end_date:
+            params["end_date"] = end_date
+        if limit:
+            params["limit"] = limit
+
+        result = await self._make_request("GET", "events/status/", params=params)
+
+        if result and result.get("success"):
+            return result.get("data", [])
+        return None
+
+    async def update_event_status(
+        self, event_id: int, new_status: str, reason: Optional[str] = None
+    ) -> bool:
+        """Update event status"""
+        logger.info(f"Updating event {event_id} status to: {new_status}")
+
+        data = {"status": new_status}
+        if reason:
+            data["reason"] = reason
+
+        result = await self._make_request(
+            "PUT", f"events/{event_id}/status/", data=data
+        )
+
+        success = bool(result and result.get("success", False))
+
+        if success:
+            logger.info(f"Successfully updated event {event_id} status to {new_status}")
+        else:
+            logger.error(f"Failed to update event {event_id} status")
+
+        return success
+
+    async def bulk_update_status(self, updates: List[Dict[str, Any]]) -> Optional[Dict]:
+        """Update the status of several events in one request"""
+        result = await self._make_request(
+            "PUT", "events/status/bulk/", data={"updates": updates}
+        )
+        if result and result.get("success"):
+            return result
+        return None
+
+    async def batch_update_status(
+        self,
+        event_updates: List[Dict[str, Union[int, str]]],
+        chunk_size: int = BULK_STATUS_CHUNK_SIZE,
+        limit: Optional[int] = None,
+    ) -> Dict[str, List[int]]:
+        """
+        Update multiple events' statuses in bulk requests of chunk_size,
+        at most limit of them in flight at a time
+
+        Returns:
+            Dict[str, List[int]]: Results with 'successful' and 'failed' event IDs
+        """
+        logger.info(f"Batch updating {len(event_updates)} events")
+
+        results, chunks = split_status_updates(event_updates, chunk_size)
+        responses = await gather_limited(
+            (self.bulk_update_status(chunk) for chunk in chunks), limit
+        )
+        for chunk, response in zip(chunks, responses):
+            merge_status_results(results, chunk, response)
+
+        logger.info(
+            f"Batch update completed: {len(results['successful'])} successful, "
+            f"{len(results['failed'])} failed"
+        )
+
+        return results
+
+    # Convenience methods
+    async def get_active_events(
+        self, limit: Optional[int] = None
+    ) -> Optional[List[Dict]]:
+        """Get all active events"""
+        return await self.get_events_by_status("active", limit=limit)
+
+    async def get_cancelled_events(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Optional[List[Dict]]:
+        """Get cancelled events with optional date range"""
+        return await self.get_events_by_status(
+            "cancelled", start_date=start_date, end_date=end_date
+        )
+
+    async def cancel_event(
+        self, event_id: int, reason: str = "Cancelled by system"
+    ) -> bool:
+        """Cancel an event"""
+        return await self.update_event_status(event_id, "cancelled", reason)
+
+    async def activate_event(self, event_id: int) -> bool:
+        """Activate an event"""
+        return await self.update_event_status(event_id, "active")
+
+
+# Singleton instance for easy importing
+async_event_client = AsyncEventServiceClient()
+
+
+class AsyncEventServiceHelper:
+    """asyncio counterpart of EventServiceHelper"""
+
+    def __init__(self, client: AsyncEventServiceClient = None):
+        self.client = client or async_event_client
+
+    async def get_event_with_fallback(
+        self, event_id: int, default: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """Get event with fallback value"""
+        event = await self.client.get_event(event_id)
+        return event if event is not None else default
+
+    async def get_all_organization_events(self, organization_id: int) -> List[Dict]:
+        """
+        Get all events of an organization across all pages, raising
+        EventServiceError if any page cannot be fetched
+        """
+        return [
+            event
+            async for event in self.client.iter_organization_events(organization_id)
+        ]
+
+    async def get_events_by_date_range(
+        self, start_date: str, end_date: str, status: str = "active"
+    ) -> List[Dict]:
+        """Get events within a date range"""
+        return (
+            await self.client.get_events_by_status(
+                status=status, start_date=start_date, end_date=end_date
+            )
+            or []
+        )
+
+
+# Create helper instance
+async_event_helper = AsyncEventServiceHelper()
@@ -111,7 +111,10 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
-    )
+    ),
+    "DEFAULT_THROTTLE_RATES": {
+        "availability": config("THROTTLE_RATE_AVAILABILITY", default="120/min"),
+    },
 }
 
 # SimpleJWT (values from .env if you want to override defaults)
@@ -163,6 +166,45 @@ REDIS_PORT = config("REDIS_PORT", default="")
 REDIS_PASSWORD = config("REDIS_PASSWORD", default="")
 REDIS_DB = config("REDIS_DB", default="")
 REDIS_USERNAME = config("REDIS_USERNAME", default="")
+# Treat REDIS_URL / REDIS_HOST as a startup node of a Redis Cluster (REDIS_DB is ignored)
+REDIS_CLUSTER = config("REDIS_CLUSTER", default=False, cast=bool)
+# Connection pool, one per worker process
+REDIS_MAX_CONNECTIONS = config("REDIS_MAX_CONNECTIONS", default=20, cast=int)
+REDIS_POOL_TIMEOUT = config("REDIS_POOL_TIMEOUT", default=5, cast=int)
+REDIS_HEALTH_CHECK_INTERVAL = config(
+    "REDIS_HEALTH_CHECK_INTERVAL", default=30, cast=int
+)
+# Value format for RedisClient writes: orjson, msgpack or json
+REDIS_CODEC = config("REDIS_CODEC", default="orjson")
+# Compress encoded values of at least THRESHOLD bytes: zstd, zlib, or empty for none
+REDIS_COMPRESSION = config("REDIS_COMPRESSION", default="zstd")
+REDIS_COMPRESSION_THRESHOLD = config(
+    "REDIS_COMPRESSION_THRESHOLD", default=1024, cast=int
+)
+REDIS_COMPRESSION_LEVEL = config("REDIS_COMPRESSION_LEVEL", default="")
+# In-process cache tier in front of cache_* keys (size 0 disables it)
+REDIS_LOCAL_CACHE_SIZE = config("REDIS_LOCAL_CACHE_SIZE", default=1024, cast=int)
+REDIS_LOCAL_CACHE_TTL = config("REDIS_LOCAL_CACHE_TTL", default=5, cast=float)
+# Socket timeouts in seconds; with fail-fast on, timed out commands are not retried
+REDIS_SOCKET_TIMEOUT = config("REDIS_SOCKET_TIMEOUT", default=5, cast=float)
+REDIS_SOCKET_CONNECT_TIMEOUT = config(
+    "REDIS_SOCKET_CONNECT_TIMEOUT", default=5, cast=float
+)
+REDIS_FAIL_FAST = config("REDIS_FAIL_FAST", default=False, cast=bool)
+# Consecutive failures that open the circuit breaker, and seconds before it probes
+REDIS_BREAKER_FAILURES = config("REDIS_BREAKER_FAILURES", default=5, cast=int)
+REDIS_BREAKER_RESET_TIMEOUT = config(
+    "REDIS_BREAKER_RESET_TIMEOUT", default=30, cast=float
+)
+# Approximate number of entries kept per Redis Stream
+REDIS_STREAM_MAXLEN = config("REDIS_STREAM_MAXLEN", default=10000, cast=int)
+# Bits and hash functions of Bloom filters; must match across services
+REDIS_BLOOM_SIZE = config("REDIS_BLOOM_SIZE", default=8388608, cast=int)
+REDIS_BLOOM_HASHES = config("REDIS_BLOOM_HASHES", default=7, cast=int)
+# Seconds event data from the event changes stream stays cached
+EVENT_CACHE_TTL = config("EVENT_CACHE_TTL", default=300, cast=int)
+# Seconds an event id confirmed missing is remembered
+EVENT_MISSING_CACHE_TTL = config("EVENT_MISSING_CACHE_TTL", default=30, cast=int)
 
 # ---------------------------------------------------------
 # CORS (Cross-Origin Resource Sharing)
@@ -172,6 +214,13 @@ CORS_ALLOWED_ORIGINS = config(
 )
 
 
+# Internal service communication settings
+INTERNAL_SERVICE_IPS = [
+    "10.0.1.100",  # Event service IP
+    "10.0.1.101",  # Other microservice IPs
+    "127.0.0.1",  # For local development
+]
+
 SERVICE_URLS = {
     "EVENT_SERVICE_URL": config("EVENT_SERVICE_URL", default="http://localhost:8001"),
     "USER_SERVICE_URL": config("USER_SERVICE_URL", default="http://localhost:8000"),
@@ -179,3 +228,22 @@ SERVICE_URLS = {
         "PAYMENT_SERVICE_URL", default="http://localhost:8003"
     ),
 }
+
+# Event service client: pooled keep-alive connections per process, timeouts
+# in seconds, and retries with jittered exponential backoff for GETs
+EVENT_SERVICE_POOL_SIZE = config("EVENT_SERVICE_POOL_SIZE", default=10, cast=int)
+EVENT_SERVICE_CONNECT_TIMEOUT = config(
+    "EVENT_SERVICE_CONNECT_TIMEOUT", default=3.05, cast=float
+)
+EVENT_SERVICE_READ_TIMEOUT = config(
+    "EVENT_SERVICE_READ_TIMEOUT", default=10, cast=float
+)
+EVENT_SERVICE_RETRIES = config("EVENT_SERVICE_RETRIES", default=2, cast=int)
+EVENT_SERVICE_BACKOFF = config("EVENT_SERVICE_BACKOFF", default=0.2, cast=float)
+# Event service responses kept locally and revalidated with If-None-Match
+EVENT_SERVICE_RESPONSE_CACHE_SIZE = config(
+    "EVENT_SERVICE_RESPONSE_CACHE_SIZE", default=1024, cast=int
+)
+EVENT_SERVICE_RESPONSE_CACHE_TTL = config(
+    "EVENT_SERVICE_RESPONSE_CACHE_TTL", default=600, cast=int
+)
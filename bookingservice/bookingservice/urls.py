@@ -15,4 +15,9 @@ urlpatterns = [
         views.get_ticket_availability,
         name="ticket-availability",
     ),
+    path(
+        "internal/v1/metrics/",
+        views.get_service_metrics,
+        name="service-metrics",
+    ),
 ]
@@ -1,10 +1,18 @@
 from rest_framework import serializers, viewsets
 from rest_framework.permissions import IsAuthenticated
-from .models import Booking
-from .serializers import BookingSerializer
-from utils.redis import redis_client
+from django.db import transaction
+from .models import Booking, Ticket
+from .serializers import BookingCreateSerializer, BookingSerializer
+from utils.redis import LockUnavailableError, event_tag, redis_client
+from utils.throttling import AvailabilityThrottle
 from .models import User
-from rest_framework.decorators import api_view
+from .permissions import IsInternalRequest
+from django.http import HttpResponse
+from rest_framework.decorators import (
+    api_view,
+    permission_classes,
+    throttle_classes,
+)
 from rest_framework.response import Response
 from rest_framework import status
 import logging
@@ -17,6 +25,9 @@ logger = logging.getLogger(__name__)
 
 use_cache = False
 
+# What availability and booking need from an event
+BOOKING_FIELDS = ["status", "ticket_types"]
+
 
 class BookingServiceError(Exception):
     """Base exception for booking service errors"""
@@ -24,7 +35,20 @@ class BookingServiceError(Exception):
     pass
 
 
+def seed_inventory(event_id, ticket_types):
+    """Start tracking stock for ticket types that are not in Redis yet"""
+    return redis_client.seed_inventory(
+        event_id,
+        {
+            ticket["id"]: ticket["quantity_total"] - ticket["quantity_sold"]
+            for ticket in ticket_types
+        },
+        limits={ticket["id"]: ticket["per_person_limit"] for ticket in ticket_types},
+    )
+
+
 @api_view(["GET"])
+@throttle_classes([AvailabilityThrottle])
 def get_ticket_availability(request, event_id):
     """
     Get ticket availability for an event
@@ -37,25 +61,24 @@ def get_ticket_availability(request, event_id):
         try:
             # Try cache first if enabled
             if use_cache:
-                ticket_keys = redis_client.get_keys(f"{event_id}:")
+                inventory = redis_client.get_inventory(event_id)
 
                 logger.info(
-                    f"Found {len(ticket_keys)} cached ticket types for event_id: {event_id}"
+                    f"Found {len(inventory)} cached ticket types for event_id: {event_id}"
                 )
-                cached_data = []
-                for key in ticket_keys:
-                    data = redis_client.get(key)
-                    if data:
-                        cached_data.append({key.split(":")[1]: data})
+                cached_data = [
+                    {ticket_type_id: remaining}
+                    for ticket_type_id, remaining in inventory.items()
+                ]
 
-                if cached_data is not None:
+                if cached_data:
                     logger.info(
                         f"Returning cached availability for event_id: {event_id}"
                     )
                     return Response({"data": cached_data}, status=status.HTTP_200_OK)
 
             # Get event details from Event Service
-            event_data = event_client.get_event(event_id)
+            event_data = event_client.get_event(event_id, fields=BOOKING_FIELDS)
 
             if not event_data:
                 raise BookingServiceError(f"Event {event_id} not found")
@@ -79,14 +102,9 @@ def get_ticket_availability(request, event_id):
                 for ticket in ticket_types
             ]
 
-            # Cache the availability data
+            # Seed the inventory without touching counters already in use
             if use_cache:
-                for ticket in ticket_types:
-                    redis_client.set(
-                        f"{event_id}:{ticket['id']}",
-                        ticket["quantity_total"] - ticket["quantity_sold"],
-                        ex=3,  # Cache for 5 minutes
-                    )
+                seed_inventory(event_id, ticket_types)
 
             logger.info(f"Successfully retrieved availability for event_id: {event_id}")
             return Response({"data": availability_data}, status=status.HTTP_200_OK)
@@ -111,13 +129,113 @@ class BookingViewSet(viewsets.ModelViewSet):
     serializer_class = BookingSerializer
     permission_classes = [IsAuthenticated]
 
-    def create(self, *args, **kwargs):
+    def create(self, request, *args, **kwargs):
         """
-        Override the default create method to set the user_id from the request.
+        Create a booking for the authenticated user.
+        1. Validate the requested ticket types against the event
+        2. Reserve stock for all of them at once in Redis
+        3. Create the booking and its tickets, releasing the stock on failure
         """
         _user = self.request.user
         user, _ = User.objects.get_or_create(remote_id=_user.id)
 
+        serializer = BookingCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        event_id = serializer.validated_data["event_id"]
+        quantities = {
+            selection["ticket_type"]: selection["quantity"]
+            for selection in serializer.validated_data["ticket_selections"]
+        }
+
+        event_data = event_client.get_event(event_id, fields=BOOKING_FIELDS)
+        if not event_data:
+            return Response(
+                {"error": f"Event {event_id} not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        if not event_data.get("status", "").lower() == "published":
+            return Response(
+                {"error": f"Event {event_id} is not active for booking"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        ticket_types = {
+            str(ticket["id"]): ticket for ticket in event_data.get("ticket_types", [])
+        }
+        unknown = [
+            ticket_type for ticket_type in quantities if ticket_type not in ticket_types
+        ]
+        if unknown:
+            return Response(
+                {"error": f"Unknown ticket types: {', '.join(unknown)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Serialize a user's bookings for one event, so a double submit waits
+        # for the first request instead of racing it through reserve and save
+        booking_lock = redis_client.lock(
+            f"booking:{event_tag(event_id)}:{user.id}", timeout=30, blocking_timeout=5
+        )
+        try:
+            acquired = booking_lock.acquire()
+        except LockUnavailableError:
+            return Response(
+                {"error": "Bookings are temporarily unavailable, please retry"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        if not acquired:
+            return Response(
+                {"error": "Another booking for this event is still being processed"},
+                status=status.HTTP_409_CONFLICT,
+            )
+        try:
+            return self._reserve_and_book(event_id, user, quantities, ticket_types)
+        finally:
+            booking_lock.release()
+
+    def _reserve_and_book(self, event_id, user, quantities, ticket_types):
+        """Reserve the tickets in Redis, then record the booking"""
+        seed_inventory(event_id, list(ticket_types.values()))
+        reservation = redis_client.reserve(event_id, quantities, user.id)
+        if not reservation["success"]:
+            reason = reservation.get("reason")
+            if reason == "unavailable":
+                return Response(
+                    {"error": "Bookings are temporarily unavailable, please retry"},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                )
+            return Response(
+                {"error": "Tickets could not be reserved", **reservation},
+                status=(
+                    status.HTTP_400_BAD_REQUEST
+                    if reason == "invalid_quantity"
+                    else status.HTTP_409_CONFLICT
+                ),
+            )
+
+        try:
+            with transaction.atomic():
+                booking = Booking.objects.create(
+                    event_id=event_id,
+                    user=user,
+                    total_amount=sum(
+                        Decimal(str(ticket_types[ticket_type]["price"])) * quantity
+                        for ticket_type, quantity in quantities.items()
+                    ),
+                )
+                for ticket_type, quantity in quantities.items():
+                    Ticket.objects.create(
+                        booking=booking,
+                        ticket_type=ticket_type,
+                        quantity=quantity,
+                        unit_price=Decimal(str(ticket_types[ticket_type]["price"])),
+                    )
+        except Exception:
+            redis_client.release(event_id, quantities, user.id)
+            raise
+
+        return Response(BookingSerializer(booking).data, status=status.HTTP_201_CREATED)
+
     def get_queryset(self):
         """
         Restricts the returned bookings to those of the currently authenticated user.
@@ -126,3 +244,30 @@ class BookingViewSet(viewsets.ModelViewSet):
         if user.is_authenticated:
             return self.queryset.filter(user_id=user.id)
         return self.queryset.none()
+
+
+@api_view(["GET"])
+@permission_classes([IsInternalRequest])
+def get_service_metrics(request):
+    """
+    Redis and event service client metrics of the worker process serving
+    the request - Internal API
+
+    GET /internal/v1/metrics/
+    ?output=prometheus returns the Prometheus text format instead of JSON.
+    """
+    if request.GET.get("output") == "prometheus":
+        return HttpResponse(
+            redis_client.metrics.render_prometheus()
+            + event_client.metrics.render_prometheus(),
+            content_type="text/plain; version=0.0.4",
+        )
+    return Response(
+        {
+            "success": True,
+            "data": {
+                "redis": redis_client.export_metrics(),
+                "event_service": event_client.stats(),
+            },
+        }
+    )
@@ -0,0 +1,109 @@
+import logging, threading, time
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker
+
+    Closed, every call is let through. After failure_threshold consecutive
+    failures the breaker opens and rejects calls for reset_timeout seconds.
+    It then goes half-open and lets a single probe through: success closes
+    it again, failure re-opens it for another reset_timeout.
+
+    Args:
+        name: Name used in log messages
+        failure_threshold: Consecutive failures that open the breaker
+        reset_timeout: Seconds to stay open before probing
+    """
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout: float = 30
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the timeout passed"""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if (
+            self._state == OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"Circuit breaker '{self.name}' closed")
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._open()
+
+    def _open(self):
+        logger.warning(
+            f"Circuit breaker '{self.name}' opened after {self._failures} "
+            f"consecutive failures, retrying in {self.reset_timeout}s"
+        )
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probing = False
+        self.opened += 1
+
+    def reset(self):
+        """Close the breaker and clear its failure count"""
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
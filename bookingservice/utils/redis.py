@@ -1,28 +1,865 @@
-import redis, json, logging
-from typing import Any, Optional, Dict, List
+import redis, redis.cluster, hashlib, json, logging, math, os, random, threading, time, uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Optional, Dict, Iterable, Iterator, List, Tuple, Union
 from django.conf import settings
 from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from utils.circuit_breaker import CircuitBreaker
+from utils.codec import Codec
+from utils.local_cache import LocalCache
+from utils.metrics import RedisMetrics, payload_size
+from utils import redis_scripts
 
 logger = logging.getLogger(__name__)
 
 
+def _text(value: Any) -> Any:
+    """Decode keys and hash fields, which come back from Redis as bytes"""
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _setting(name: str, default: Any = None) -> Any:
+    """Read a setting, treating empty values from the environment as unset"""
+    value = getattr(settings, name, None)
+    return default if value in (None, "") else value
+
+
+class InstrumentedConnectionPool(redis.BlockingConnectionPool):
+    """
+    Blocking connection pool that keeps track of how many connections are
+    checked out and how often callers had to wait for one.
+    """
+
+    def reset(self):
+        self._stats_lock = threading.Lock()
+        self.in_use = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+        super().reset()
+
+    def get_connection(self, *args, **kwargs):
+        must_wait = self.pool.empty()
+        started = time.monotonic()
+        try:
+            connection = super().get_connection(*args, **kwargs)
+        except redis.ConnectionError:
+            if must_wait:
+                with self._stats_lock:
+                    self.waits += 1
+                    self.timeouts += 1
+                    self.wait_time += time.monotonic() - started
+            raise
+
+        with self._stats_lock:
+            self.in_use += 1
+            if must_wait:
+                self.waits += 1
+                self.wait_time += time.monotonic() - started
+        return connection
+
+    def release(self, connection):
+        with self._stats_lock:
+            self.in_use = max(0, self.in_use - 1)
+        super().release(connection)
+
+    def stats(self) -> Dict[str, Any]:
+        created = len(self._connections)
+        return {
+            "max_connections": self.max_connections,
+            "created": created,
+            "in_use": self.in_use,
+            "idle": max(0, created - self.in_use),
+            "waits": self.waits,
+            "wait_time": round(self.wait_time, 6),
+            "timeouts": self.timeouts,
+        }
+
+
+class CircuitOpenError(redis.ConnectionError):
+    """Raised instead of calling Redis while the circuit breaker is open"""
+
+
+def _guarded_call(client: Any, command: Any, bytes_out: int, call: Callable) -> Any:
+    """
+    Run one round trip through the client's circuit breaker and metrics.
+    Only connection errors and timeouts count as breaker failures; any other
+    error still means Redis answered.
+    """
+    breaker, metrics = client.breaker, client.metrics
+    if breaker is not None and not breaker.allow():
+        raise CircuitOpenError(f"Redis circuit breaker is open, {command} skipped")
+
+    started = time.perf_counter()
+    try:
+        result = call()
+    except Exception as e:
+        if breaker is not None:
+            if isinstance(e, (redis.ConnectionError, redis.TimeoutError)):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        if metrics is not None:
+            metrics.observe(command, time.perf_counter() - started, True, bytes_out)
+        raise
+
+    if breaker is not None:
+        breaker.record_success()
+    if metrics is not None:
+        metrics.observe(
+            command,
+            time.perf_counter() - started,
+            bytes_out=bytes_out,
+            bytes_in=payload_size(result),
+        )
+    return result
+
+
+class InstrumentedPipeline(redis.client.Pipeline):
+    """Pipeline that records each execute() as one round trip"""
+
+    metrics: Optional[RedisMetrics] = None
+    breaker: Optional[CircuitBreaker] = None
+
+    def execute(self, raise_on_error: bool = True) -> List[Any]:
+        if not self.command_stack:
+            return super().execute(raise_on_error)
+        return _guarded_call(
+            self,
+            "MULTI" if self.transaction else "PIPELINE",
+            sum(payload_size(args) for args, _ in self.command_stack),
+            lambda: super(InstrumentedPipeline, self).execute(raise_on_error),
+        )
+
+
+class InstrumentedRedis(redis.Redis):
+    """
+    Redis client that records latency, errors and bytes of every command and
+    fails fast while its circuit breaker is open
+    """
+
+    metrics: Optional[RedisMetrics] = None
+    breaker: Optional[CircuitBreaker] = None
+
+    def execute_command(self, *args, **options):
+        return _guarded_call(
+            self,
+            args[0],
+            payload_size(args[1:]),
+            lambda: super(InstrumentedRedis, self).execute_command(*args, **options),
+        )
+
+    def pipeline(self, transaction=True, shard_hint=None) -> InstrumentedPipeline:
+        pipeline = InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+        pipeline.metrics = self.metrics
+        pipeline.breaker = self.breaker
+        return pipeline
+
+
+class InstrumentedClusterPipeline(redis.cluster.ClusterPipeline):
+    """Cluster pipeline that records each execute() as one round trip"""
+
+    metrics: Optional[RedisMetrics] = None
+    breaker: Optional[CircuitBreaker] = None
+
+    def execute(self, raise_on_error: bool = True) -> List[Any]:
+        if not len(self):
+            return super().execute(raise_on_error)
+        queue = self._execution_strategy.command_queue
+        return _guarded_call(
+            self,
+            "PIPELINE",
+            sum(payload_size(command.args) for command in queue),
+            lambda: super(InstrumentedClusterPipeline, self).execute(raise_on_error),
+        )
+
+
+class InstrumentedRedisCluster(redis.cluster.RedisCluster):
+    """Redis Cluster counterpart of InstrumentedRedis"""
+
+    metrics: Optional[RedisMetrics] = None
+    breaker: Optional[CircuitBreaker] = None
+
+    def execute_command(self, *args, **kwargs):
+        return _guarded_call(
+            self,
+            args[0],
+            payload_size(args[1:]),
+            lambda: super(InstrumentedRedisCluster, self).execute_command(
+                *args, **kwargs
+            ),
+        )
+
+    def pipeline(self, transaction=None, shard_hint=None):
+        if shard_hint:
+            raise redis.cluster.RedisClusterException(
+                "shard_hint is deprecated in cluster mode"
+            )
+        pipeline = InstrumentedClusterPipeline(
+            nodes_manager=self.nodes_manager,
+            commands_parser=self.commands_parser,
+            startup_nodes=self.nodes_manager.startup_nodes,
+            result_callbacks=self.result_callbacks,
+            cluster_response_callbacks=self.cluster_response_callbacks,
+            read_from_replicas=self.read_from_replicas,
+            load_balancing_strategy=self.load_balancing_strategy,
+            reinitialize_steps=self.reinitialize_steps,
+            retry=self.retry,
+            lock=self._lock,
+            transaction=transaction,
+        )
+        pipeline.metrics = self.metrics
+        pipeline.breaker = self.breaker
+        return pipeline
+
+
+def pool_options() -> Dict[str, Any]:
+    """Connection and pool options shared by the sync and async clients"""
+    return {
+        "decode_responses": False,
+        "socket_connect_timeout": float(_setting("REDIS_SOCKET_CONNECT_TIMEOUT", 5)),
+        "socket_timeout": float(_setting("REDIS_SOCKET_TIMEOUT", 5)),
+        # Fail fast: a timed out command is not retried on a new connection
+        "retry_on_timeout": not _setting("REDIS_FAIL_FAST", False),
+        "max_connections": int(_setting("REDIS_MAX_CONNECTIONS", 20)),
+        "timeout": int(_setting("REDIS_POOL_TIMEOUT", 5)),
+        "health_check_interval": int(_setting("REDIS_HEALTH_CHECK_INTERVAL", 30)),
+    }
+
+
+def build_codec() -> Codec:
+    """Value codec configured by the REDIS_CODEC and REDIS_COMPRESSION* settings"""
+    level = _setting("REDIS_COMPRESSION_LEVEL")
+    return Codec(
+        _setting("REDIS_CODEC", "orjson"),
+        compression=_setting("REDIS_COMPRESSION", "zstd"),
+        threshold=int(_setting("REDIS_COMPRESSION_THRESHOLD", 1024)),
+        level=None if level is None else int(level),
+    )
+
+
+def build_pool(pool_class: type, **options) -> Any:
+    """Create a pool of pool_class from REDIS_URL or the individual settings"""
+    options = {**pool_options(), **options}
+
+    url = _setting("REDIS_URL")
+    if url:
+        return pool_class.from_url(url, **options)
+
+    return pool_class(
+        host=_setting("REDIS_HOST", "localhost"),
+        port=int(_setting("REDIS_PORT", 6379)),
+        db=int(_setting("REDIS_DB", 0)),
+        username=_setting("REDIS_USERNAME"),
+        password=_setting("REDIS_PASSWORD"),
+        **options,
+    )
+
+
+def cluster_enabled() -> bool:
+    """Whether REDIS_URL / REDIS_HOST point at a Redis Cluster"""
+    return bool(_setting("REDIS_CLUSTER", False))
+
+
+def build_cluster(cluster_class: type, **options) -> Any:
+    """
+    Create a cluster client of cluster_class, using REDIS_URL or the
+    individual settings as the startup node
+    """
+    options = {**pool_options(), **options}
+    # Each node gets its own pool; there is no blocking pool to wait on
+    options.pop("timeout", None)
+    # The asyncio cluster client only takes the generic form of this option
+    if options.pop("retry_on_timeout", False):
+        options["retry_on_error"] = [redis.TimeoutError]
+
+    url = _setting("REDIS_URL")
+    if url:
+        return cluster_class.from_url(url, **options)
+
+    return cluster_class(
+        host=_setting("REDIS_HOST", "localhost"),
+        port=int(_setting("REDIS_PORT", 6379)),
+        username=_setting("REDIS_USERNAME"),
+        password=_setting("REDIS_PASSWORD"),
+        **options,
+    )
+
+
+# Key conventions
+#
+# Every key that belongs to one event embeds the event id as a hash tag,
+# "{<event_id>}". Redis Cluster places keys by their hash tag, so all keys
+# of an event live in the same slot and multi-key scripts, transactions
+# and pipelines on them stay valid.
+def event_tag(event_id: Any) -> str:
+    """Hash tag shared by all keys of an event"""
+    return f"{{{event_id}}}"
+
+
+def event_key(event_id: Any) -> str:
+    """
+    Snapshot hash of event data, written by the event service on create and
+    warm-up and kept up to date by the booking service's event changes
+    consumer
+    """
+    return f"event_service:event:{event_tag(event_id)}"
+
+
+def ticket_types_key(key: str) -> str:
+    """Hash of the ticket types of the event snapshot at key, by ticket type id"""
+    return f"{key}:ticket_types"
+
+
+def split_event_snapshot(data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Event data as the field hash and the ticket type hash of a snapshot"""
+    fields = {k: v for k, v in data.items() if k != "ticket_types"}
+    ticket_types = {
+        str(ticket_type["id"]): ticket_type
+        for ticket_type in data.get("ticket_types") or []
+    }
+    return fields, ticket_types
+
+
+def join_event_snapshot(
+    fields: Dict[str, Any], ticket_types: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Inverse of split_event_snapshot"""
+    return {
+        **fields,
+        "ticket_types": sorted(
+            ticket_types.values(), key=lambda ticket_type: ticket_type["id"]
+        ),
+    }
+
+
+def inventory_key(event_id: Any) -> str:
+    """Hash holding remaining stock for every ticket type of an event"""
+    return f"inventory:{event_tag(event_id)}"
+
+
+def inventory_limits_key(event_id: Any) -> str:
+    """Hash holding the per-person limit of every ticket type of an event"""
+    return f"inventory_limits:{event_tag(event_id)}"
+
+
+def inventory_holds_key(event_id: Any, user_id: Any) -> str:
+    """Hash holding how many tickets of each type a user has reserved"""
+    return f"inventory_holds:{event_tag(event_id)}:{user_id}"
+
+
+def cache_key(key: str) -> str:
+    """Namespaced key for cache_* helpers"""
+    return f"cache:{key}"
+
+
+# Pub/sub channel announcing cache: keys that changed, as "<origin>:<key>"
+CACHE_INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Marks values written by cache_get_or_set, which carry refresh metadata
+CACHE_ENVELOPE = "__cache_envelope__"
+
+# Marks values written by cache_set_tagged, which carry their tag generations
+TAGGED_ENVELOPE = "__tagged_envelope__"
+
+
+def cache_tag_key(tag: str) -> str:
+    """Generation counter of a cache tag, bumped to invalidate its entries"""
+    return f"cache_tag:{tag}"
+
+
+# Bump to orphan every cached view after a change to what views return
+VIEW_CACHE_VERSION = 1
+
+
+def stable_digest(value: Any) -> str:
+    """Digest of value that is identical across processes and restarts"""
+    canonical = json.dumps(
+        value, sort_keys=True, separators=(",", ":"), cls=DjangoJSONEncoder
+    )
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def view_cache_key(
+    view_name: str,
+    params: Dict[str, Any],
+    scope: str = "public",
+    version: int = VIEW_CACHE_VERSION,
+) -> str:
+    """
+    Deterministic key for cached view data
+
+    Args:
+        view_name: Name of the view
+        params: Anything the response depends on (query, path kwargs, ...)
+        scope: Who the response is for, e.g. "public" or "user:42"
+        version: Key version, see VIEW_CACHE_VERSION
+    """
+    return f"view:v{version}:{view_name}:{scope}:{stable_digest(params)}"
+
+
+def lock_key(name: str) -> str:
+    """Key of a distributed lock"""
+    return f"lock:{name}"
+
+
+def cache_lock_key(key: str) -> str:
+    """Short-lived lock held while one worker recomputes a cache entry"""
+    return f"lock:cache:{key}"
+
+
+def unwrap_cached(value: Any) -> Any:
+    """Return the payload of a cache_get_or_set envelope, or value unchanged"""
+    if isinstance(value, dict) and value.get(CACHE_ENVELOPE):
+        return value.get("value")
+    return value
+
+
+def stream_key(name: str) -> str:
+    """Redis Stream holding messages of a topic"""
+    return f"stream:{name}"
+
+
+# Topic of event and ticket type changes published by the event service
+EVENT_CHANGES_STREAM = "event_changes"
+
+
+def bloom_key(name: str) -> str:
+    """
+    Bitmap of a Bloom filter. The name is a hash tag, so a rebuild can write
+    a temporary key in the same cluster slot and rename it into place.
+    """
+    return f"bloom:{{{name}}}"
+
+
+# Bloom filter of the ids of every existing event
+EVENT_IDS_FILTER = "event_ids"
+
+
+def bloom_offsets(item: Any, size: int, hashes: int) -> List[int]:
+    """
+    Bit offsets of item in a Bloom filter of size bits probed with hashes
+    functions, derived from one blake2b digest by double hashing
+    """
+    digest = hashlib.blake2b(str(item).encode("utf-8"), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "big")
+    h2 = int.from_bytes(digest[8:], "big") | 1
+    return [(h1 + i * h2) % size for i in range(hashes)]
+
+
+def session_key(session_id: str) -> str:
+    """Key holding a user session"""
+    return f"session:{session_id}"
+
+
+def rate_limit_key(identifier: str) -> str:
+    """Key holding rate limit state for an identifier"""
+    return f"rate_limit:{identifier}"
+
+
+class RedisPipeline:
+    """
+    Thin wrapper around a redis-py pipeline that queues commands with the
+    same codec as RedisClient and decodes the results on execute.
+
+    Usage:
+        with redis_client.pipeline() as pipe:
+            pipe.get("a")
+            pipe.incr("b")
+        a, b = pipe.results
+    """
+
+    def __init__(self, pipeline, codec: Codec):
+        self._pipeline = pipeline
+        self._codec = codec
+        self._decoders: List[Optional[Callable[[Any], Any]]] = []
+        self.results: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self._decoders)
+
+    def _queue(self, decoder: Optional[Callable[[Any], Any]] = None) -> "RedisPipeline":
+        self._decoders.append(decoder)
+        return self
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> "RedisPipeline":
+        self._pipeline.set(key, self._codec.encode(value), ex=ttl or None)
+        return self._queue()
+
+    def get(self, key: str) -> "RedisPipeline":
+        self._pipeline.get(key)
+        return self._queue(self._codec.decode)
+
+    def delete(self, *keys: str) -> "RedisPipeline":
+        self._pipeline.delete(*keys)
+        return self._queue()
+
+    def exists(self, key: str) -> "RedisPipeline":
+        self._pipeline.exists(key)
+        return self._queue(bool)
+
+    def expire(self, key: str, ttl: int) -> "RedisPipeline":
+        self._pipeline.expire(key, ttl)
+        return self._queue()
+
+    def incr(self, key: str, amount: int = 1) -> "RedisPipeline":
+        self._pipeline.incr(key, amount)
+        return self._queue()
+
+    def decr(self, key: str, amount: int = 1) -> "RedisPipeline":
+        self._pipeline.decr(key, amount)
+        return self._queue()
+
+    def hset(self, name: str, mapping: Dict[str, Any]) -> "RedisPipeline":
+        self._pipeline.hset(
+            name, mapping={k: self._codec.encode(v) for k, v in mapping.items()}
+        )
+        return self._queue()
+
+    def hsetnx(self, name: str, key: str, value: Any) -> "RedisPipeline":
+        self._pipeline.hsetnx(name, key, self._codec.encode(value))
+        return self._queue(bool)
+
+    def hget(self, name: str, key: str) -> "RedisPipeline":
+        self._pipeline.hget(name, key)
+        return self._queue(self._codec.decode)
+
+    def hmget(self, name: str, keys: List[str]) -> "RedisPipeline":
+        self._pipeline.hmget(name, keys)
+        return self._queue(
+            lambda values: [
+                None if value is None else self._codec.decode(value) for value in values
+            ]
+        )
+
+    def hgetall(self, name: str) -> "RedisPipeline":
+        self._pipeline.hgetall(name)
+        return self._queue(
+            lambda data: {
+                _text(k): self._codec.decode(v) for k, v in (data or {}).items()
+            }
+        )
+
+    def set_event_snapshot(
+        self, key: str, data: Dict[str, Any], ttl: Optional[int] = None
+    ) -> "RedisPipeline":
+        """Replace the event snapshot at key, see RedisClient.set_event_snapshot"""
+        fields, ticket_types = split_event_snapshot(data)
+        self.delete(key, ticket_types_key(key))
+        self.hset(key, fields)
+        if ticket_types:
+            self.hset(ticket_types_key(key), ticket_types)
+        if ttl:
+            self.expire(key, ttl)
+            self.expire(ticket_types_key(key), ttl)
+        return self
+
+    def execute(self) -> List[Any]:
+        """Send all queued commands in one round trip and decode the replies"""
+        if not self._decoders:
+            self.results = []
+            return self.results
+
+        try:
+            raw_results = self._pipeline.execute(raise_on_error=False)
+        except Exception as e:
+            logger.error(f"Redis PIPELINE error: {e}")
+            raw_results = [e] * len(self._decoders)
+
+        return self._collect(raw_results)
+
+    def _collect(self, raw_results: List[Any]) -> List[Any]:
+        """Decode raw pipeline replies, turning per-command errors into None"""
+        results = []
+        for decoder, raw in zip(self._decoders, raw_results):
+            if isinstance(raw, Exception):
+                logger.error(f"Redis PIPELINE command error: {raw}")
+                results.append(None)
+            elif decoder is not None:
+                try:
+                    results.append(decoder(raw))
+                except Exception as e:
+                    logger.error(f"Redis PIPELINE decode error: {e}")
+                    results.append(None)
+            else:
+                results.append(raw)
+
+        self._decoders = []
+        self.results = results
+        return results
+
+
+class LockError(Exception):
+    """A lock could not be acquired"""
+
+
+class LockUnavailableError(LockError):
+    """Redis failed (or its circuit breaker is open) while taking a lock"""
+
+
+class RedisLock:
+    """
+    Token-owned distributed lock that expires on its own
+
+    Only the holder of the token can release or extend the lock, so a caller
+    whose lock expired cannot remove one another caller has since acquired.
+    Get one from RedisClient.lock.
+
+    Usage:
+        with redis_client.lock(f"reconcile:{event_tag(event_id)}", timeout=30):
+            ...
+    """
+
+    def __init__(
+        self,
+        client: "RedisClient",
+        name: str,
+        timeout: float = 10,
+        blocking_timeout: Optional[float] = None,
+    ):
+        self.client = client
+        self.name = name
+        self.key = lock_key(name)
+        self.timeout = timeout
+        self.blocking_timeout = blocking_timeout
+        self.token: Optional[str] = None
+
+    def acquire(
+        self, blocking: bool = True, blocking_timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Try to take the lock, waiting up to blocking_timeout seconds (the
+        lock's default when not given; forever when both are None) unless
+        blocking is False. Returns False if another holder kept it, and
+        raises LockUnavailableError if Redis could not be asked.
+        """
+        if blocking_timeout is None:
+            blocking_timeout = self.blocking_timeout
+        token = uuid.uuid4().hex
+        metrics = self.client.metrics
+        started = time.monotonic()
+        delay = 0.01
+        contended = False
+
+        while True:
+            try:
+                acquired = self.client.redis_client.set(
+                    self.key, token, nx=True, px=int(self.timeout * 1000)
+                )
+            except Exception as e:
+                logger.error(f"Redis lock error for {self.name}: {e}")
+                metrics.record_lock("errors", time.monotonic() - started)
+                raise LockUnavailableError(
+                    f"Could not reach Redis for lock {self.name}"
+                ) from e
+
+            waited = time.monotonic() - started
+            if acquired:
+                self.token = token
+                metrics.record_lock("acquired", waited)
+                if contended:
+                    metrics.record_lock("contended")
+                return True
+
+            if not blocking or (
+                blocking_timeout is not None and waited >= blocking_timeout
+            ):
+                metrics.record_lock("timeouts", waited)
+                return False
+
+            # Back off with jitter so waiters do not retry in lockstep
+            contended = True
+            sleep = delay * (0.5 + random.random())
+            if blocking_timeout is not None:
+                sleep = min(sleep, blocking_timeout - waited)
+            time.sleep(max(sleep, 0))
+            delay = min(delay * 2, 0.2)
+
+    def release(self) -> bool:
+        """Release the lock if this instance still owns it"""
+        if self.token is None:
+            return False
+        token, self.token = self.token, None
+        try:
+            released = self.client._run_script(
+                redis_scripts.COMPARE_AND_DELETE, keys=[self.key], args=[token]
+            )
+        except Exception as e:
+            logger.error(f"Redis unlock error for {self.name}: {e}")
+            return False
+        self.client.metrics.record_lock("released" if released else "lost")
+        return bool(released)
+
+    def extend(self, timeout: Optional[float] = None) -> bool:
+        """
+        Reset the expiry to timeout seconds from now (the lock's timeout when
+        not given). Returns False if the lock was lost in the meantime.
+        """
+        if self.token is None:
+            return False
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            extended = self.client._run_script(
+                redis_scripts.COMPARE_AND_PEXPIRE,
+                keys=[self.key],
+                args=[self.token, int(timeout * 1000)],
+            )
+        except Exception as e:
+            logger.error(f"Redis lock extend error for {self.name}: {e}")
+            return False
+        if not extended:
+            self.token = None
+        self.client.metrics.record_lock("extended" if extended else "lost")
+        return bool(extended)
+
+    @property
+    def owned(self) -> bool:
+        """Whether this instance holds a token (the lock may have expired)"""
+        return self.token is not None
+
+    def __enter__(self) -> "RedisLock":
+        if not self.acquire():
+            raise LockError(f"Could not acquire lock {self.name}")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
 class RedisClient:
     """
     Redis client wrapper with helper methods for common operations
     """
 
     def __init__(self):
-        """Initialize Redis connection"""
-        self.redis_client = redis.Redis(
-            host=getattr(settings, "REDIS_HOST", "localhost"),
-            port=getattr(settings, "REDIS_PORT", 6379),
-            db=getattr(settings, "REDIS_DB", 0),
-            password=getattr(settings, "REDIS_PASSWORD", None),
-            decode_responses=True,
-            socket_connect_timeout=5,
-            socket_timeout=5,
-            retry_on_timeout=True,
+        """
+        Prepare the client without connecting. The connection pool is created
+        on first use in each process, so instances built at import time are
+        safe to share with forked workers.
+        """
+        self._lock = threading.Lock()
+        self._pool: Optional[InstrumentedConnectionPool] = None
+        self._client: Optional[Union[InstrumentedRedis, InstrumentedRedisCluster]] = (
+            None
         )
+        self._pid: Optional[int] = None
+        self._codec: Optional[Codec] = None
+        self._breaker: Optional[CircuitBreaker] = None
+        self._scripts: Dict[str, Any] = {}
+        self._local_cache: Optional[LocalCache] = None
+        self._listener: Optional[threading.Thread] = None
+        self._origin = uuid.uuid4().hex
+        self.cache_redis_hits = 0
+        self.cache_redis_misses = 0
+        self.metrics = RedisMetrics()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self):
+        """Drop the parent's pool without touching its sockets"""
+        self._lock = threading.Lock()
+        self._pool = None
+        self._client = None
+        self._pid = None
+        self._breaker = None
+        # The invalidation listener thread does not survive a fork
+        self._local_cache = None
+        self._listener = None
+        self._origin = uuid.uuid4().hex
+        self.cache_redis_hits = 0
+        self.cache_redis_misses = 0
+        self.metrics = RedisMetrics()
+
+    def _build_pool(self) -> InstrumentedConnectionPool:
+        """Create the connection pool from REDIS_URL or the individual settings"""
+        return build_pool(InstrumentedConnectionPool)
+
+    @property
+    def is_cluster(self) -> bool:
+        return cluster_enabled()
+
+    @property
+    def redis_client(self) -> Union[InstrumentedRedis, InstrumentedRedisCluster]:
+        """
+        Redis connection for the current process, created on first use. With
+        REDIS_CLUSTER set this is a cluster client that routes each command
+        to the node owning its key.
+        """
+        pid = os.getpid()
+        if self._client is None or self._pid != pid:
+            with self._lock:
+                if self._client is None or self._pid != pid:
+                    if self.is_cluster:
+                        self._pool = None
+                        self._client = build_cluster(InstrumentedRedisCluster)
+                    else:
+                        self._pool = self._build_pool()
+                        self._client = InstrumentedRedis(connection_pool=self._pool)
+                    self._client.metrics = self.metrics
+                    self._client.breaker = self.breaker
+                    self._pid = pid
+        return self._client
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        """
+        Circuit breaker in front of every command. While it is open, calls
+        fail immediately and methods return their usual defaults.
+        """
+        if self._breaker is None:
+            self._breaker = CircuitBreaker(
+                "redis",
+                failure_threshold=int(_setting("REDIS_BREAKER_FAILURES", 5)),
+                reset_timeout=float(_setting("REDIS_BREAKER_RESET_TIMEOUT", 30)),
+            )
+        return self._breaker
+
+    @property
+    def codec(self) -> Codec:
+        """Value codec, configured by the REDIS_CODEC and compression settings"""
+        if self._codec is None:
+            self._codec = build_codec()
+        return self._codec
+
+    def _encode(self, value: Any) -> bytes:
+        return self.codec.encode(value)
+
+    def _decode(self, value: Any) -> Any:
+        return self.codec.decode(value)
+
+    def _run_script(self, source: str, keys: List[str], args: List[Any]) -> Any:
+        """Run a Lua script via EVALSHA, loading it on first use"""
+        script = self._scripts.get(source)
+        if script is None:
+            script = self._scripts[source] = self.redis_client.register_script(source)
+        return script(keys=keys, args=args, client=self.redis_client)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool usage for this process (empty before first use)"""
+        if self._pool is None or self._pid != os.getpid():
+            return {}
+        return {"pid": self._pid, **self._pool.stats()}
+
+    def export_metrics(self) -> Dict[str, Any]:
+        """
+        Command latency histograms, error counts, bytes in/out and lookup hit
+        ratios per key namespace, with pool and cache tier stats, for this
+        process
+        """
+        return {
+            **self.metrics.snapshot(),
+            "pool": self.pool_stats(),
+            "cache": self.cache_stats(),
+            "breaker": self.breaker.stats(),
+            "compression": self.codec.stats(),
+        }
+
+    def reset_metrics(self):
+        """Zero the command, lookup and compression counters (e.g. between tests)"""
+        self.metrics.reset()
+        self.codec.reset_stats()
 
     def is_connected(self) -> bool:
         """Check if Redis is connected"""
@@ -55,6 +892,82 @@ class RedisClient:
             logger.error(f"Redis INCR error for key {key}: {e}")
             return None
 
+    # Batch Operations
+    @contextmanager
+    def pipeline(self, transaction: bool = False) -> Iterator[RedisPipeline]:
+        """
+        Queue several commands and send them in a single round trip.
+        Anything still queued is executed when the block exits cleanly.
+        """
+        pipe = RedisPipeline(
+            self.redis_client.pipeline(transaction=transaction), self.codec
+        )
+        yield pipe
+        if len(pipe):
+            pipe.execute()
+
+    def mget(self, keys: List[str], default: Any = None) -> List[Any]:
+        """Get several keys in one round trip, in the order given"""
+        if not keys:
+            return []
+        try:
+            if self.is_cluster:
+                # Keys may live on different nodes; one MGET per slot
+                values = self.redis_client.mget_nonatomic(keys)
+            else:
+                values = self.redis_client.mget(keys)
+            for key, value in zip(keys, values):
+                self.metrics.record_lookup(key, value is not None)
+            return [default if v is None else self._decode(v) for v in values]
+        except Exception as e:
+            logger.error(f"Redis MGET error for keys {keys}: {e}")
+            return [default] * len(keys)
+
+    def mset(
+        self, mapping: Dict[str, Any], ttl: Union[int, Dict[str, int], None] = None
+    ) -> bool:
+        """
+        Set several key-value pairs in one round trip
+
+        Args:
+            mapping: Keys and values to store (values serialized as in set)
+            ttl: Either one TTL in seconds for every key, or a dict of per-key TTLs
+        """
+        if not mapping:
+            return True
+        try:
+            if not ttl:
+                encoded = {k: self._encode(v) for k, v in mapping.items()}
+                if self.is_cluster:
+                    return all(self.redis_client.mset_nonatomic(encoded))
+                return self.redis_client.mset(encoded)
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in mapping.items():
+                key_ttl = ttl.get(key) if isinstance(ttl, dict) else ttl
+                pipe.set(key, self._encode(value), ex=key_ttl or None)
+            return all(pipe.execute())
+        except Exception as e:
+            logger.error(f"Redis MSET error for keys {list(mapping)}: {e}")
+            return False
+
+    def incr_many(self, amounts: Dict[str, int]) -> Dict[str, Optional[int]]:
+        """Increment several counters in one round trip, returning the new values"""
+        if not amounts:
+            return {}
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, amount in amounts.items():
+                pipe.incrby(key, amount)
+            return dict(zip(amounts, pipe.execute()))
+        except Exception as e:
+            logger.error(f"Redis INCR error for keys {list(amounts)}: {e}")
+            return {key: None for key in amounts}
+
+    def decr_many(self, amounts: Dict[str, int]) -> Dict[str, Optional[int]]:
+        """Decrement several counters in one round trip, returning the new values"""
+        return self.incr_many({key: -amount for key, amount in amounts.items()})
+
     # Basic Key-Value Operations
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """
@@ -62,14 +975,11 @@ class RedisClient:
 
         Args:
             key: Redis key
-            value: Value to store (will be JSON serialized)
+            value: Value to store (encoded with the configured codec)
             ttl: Time to live in seconds
         """
         try:
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value, cls=DjangoJSONEncoder)
-            elif not isinstance(value, str):
-                value = str(value)
+            value = self._encode(value)
 
             if ttl:
                 return self.redis_client.setex(key, ttl, value)
@@ -82,14 +992,10 @@ class RedisClient:
         """Get value by key with optional default"""
         try:
             value = self.redis_client.get(key)
+            self.metrics.record_lookup(key, value is not None)
             if value is None:
                 return default
-
-            # Try to parse as JSON
-            try:
-                return json.loads(value)
-            except (json.JSONDecodeError, TypeError):
-                return value
+            return self._decode(value)
         except Exception as e:
             logger.error(f"Redis GET error for key {key}: {e}")
             return default
@@ -130,13 +1036,7 @@ class RedisClient:
     def hset(self, name: str, mapping: Dict[str, Any]) -> int:
         """Set hash fields"""
         try:
-            # Convert dict values to JSON strings
-            serialized_mapping = {}
-            for k, v in mapping.items():
-                if isinstance(v, (dict, list)):
-                    serialized_mapping[k] = json.dumps(v, cls=DjangoJSONEncoder)
-                else:
-                    serialized_mapping[k] = str(v)
+            serialized_mapping = {k: self._encode(v) for k, v in mapping.items()}
             return self.redis_client.hset(name, mapping=serialized_mapping)
         except Exception as e:
             logger.error(f"Redis HSET error for hash {name}: {e}")
@@ -148,11 +1048,7 @@ class RedisClient:
             value = self.redis_client.hget(name, key)
             if value is None:
                 return default
-
-            try:
-                return json.loads(value)
-            except (json.JSONDecodeError, TypeError):
-                return value
+            return self._decode(value)
         except Exception as e:
             logger.error(f"Redis HGET error for hash {name}, key {key}: {e}")
             return default
@@ -161,13 +1057,7 @@ class RedisClient:
         """Get all hash fields and values"""
         try:
             data = self.redis_client.hgetall(name)
-            result = {}
-            for k, v in data.items():
-                try:
-                    result[k] = json.loads(v)
-                except (json.JSONDecodeError, TypeError):
-                    result[k] = v
-            return result
+            return {_text(k): self._decode(v) for k, v in data.items()}
         except Exception as e:
             logger.error(f"Redis HGETALL error for hash {name}: {e}")
             return {}
@@ -192,12 +1082,7 @@ class RedisClient:
     def lpush(self, name: str, *values: Any) -> int:
         """Push values to left of list"""
         try:
-            serialized_values = []
-            for v in values:
-                if isinstance(v, (dict, list)):
-                    serialized_values.append(json.dumps(v, cls=DjangoJSONEncoder))
-                else:
-                    serialized_values.append(str(v))
+            serialized_values = [self._encode(v) for v in values]
             return self.redis_client.lpush(name, *serialized_values)
         except Exception as e:
             logger.error(f"Redis LPUSH error for list {name}: {e}")
@@ -206,12 +1091,7 @@ class RedisClient:
     def rpush(self, name: str, *values: Any) -> int:
         """Push values to right of list"""
         try:
-            serialized_values = []
-            for v in values:
-                if isinstance(v, (dict, list)):
-                    serialized_values.append(json.dumps(v, cls=DjangoJSONEncoder))
-                else:
-                    serialized_values.append(str(v))
+            serialized_values = [self._encode(v) for v in values]
             return self.redis_client.rpush(name, *serialized_values)
         except Exception as e:
             logger.error(f"Redis RPUSH error for list {name}: {e}")
@@ -223,11 +1103,7 @@ class RedisClient:
             value = self.redis_client.lpop(name)
             if value is None:
                 return None
-
-            try:
-                return json.loads(value)
-            except (json.JSONDecodeError, TypeError):
-                return value
+            return self._decode(value)
         except Exception as e:
             logger.error(f"Redis LPOP error for list {name}: {e}")
             return None
@@ -238,11 +1114,7 @@ class RedisClient:
             value = self.redis_client.rpop(name)
             if value is None:
                 return None
-
-            try:
-                return json.loads(value)
-            except (json.JSONDecodeError, TypeError):
-                return value
+            return self._decode(value)
         except Exception as e:
             logger.error(f"Redis RPOP error for list {name}: {e}")
             return None
@@ -251,13 +1123,7 @@ class RedisClient:
         """Get list range"""
         try:
             values = self.redis_client.lrange(name, start, end)
-            result = []
-            for v in values:
-                try:
-                    result.append(json.loads(v))
-                except (json.JSONDecodeError, TypeError):
-                    result.append(v)
-            return result
+            return [self._decode(v) for v in values]
         except Exception as e:
             logger.error(f"Redis LRANGE error for list {name}: {e}")
             return []
@@ -274,12 +1140,7 @@ class RedisClient:
     def sadd(self, name: str, *values: Any) -> int:
         """Add values to set"""
         try:
-            serialized_values = []
-            for v in values:
-                if isinstance(v, (dict, list)):
-                    serialized_values.append(json.dumps(v, cls=DjangoJSONEncoder))
-                else:
-                    serialized_values.append(str(v))
+            serialized_values = [self._encode(v) for v in values]
             return self.redis_client.sadd(name, *serialized_values)
         except Exception as e:
             logger.error(f"Redis SADD error for set {name}: {e}")
@@ -288,12 +1149,7 @@ class RedisClient:
     def srem(self, name: str, *values: Any) -> int:
         """Remove values from set"""
         try:
-            serialized_values = []
-            for v in values:
-                if isinstance(v, (dict, list)):
-                    serialized_values.append(json.dumps(v, cls=DjangoJSONEncoder))
-                else:
-                    serialized_values.append(str(v))
+            serialized_values = [self._encode(v) for v in values]
             return self.redis_client.srem(name, *serialized_values)
         except Exception as e:
             logger.error(f"Redis SREM error for set {name}: {e}")
@@ -303,13 +1159,7 @@ class RedisClient:
         """Get all set members"""
         try:
             values = self.redis_client.smembers(name)
-            result = set()
-            for v in values:
-                try:
-                    result.add(json.loads(v))
-                except (json.JSONDecodeError, TypeError):
-                    result.add(v)
-            return result
+            return {self._decode(v) for v in values}
         except Exception as e:
             logger.error(f"Redis SMEMBERS error for set {name}: {e}")
             return set()
@@ -317,118 +1167,887 @@ class RedisClient:
     def sismember(self, name: str, value: Any) -> bool:
         """Check if value is in set"""
         try:
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value, cls=DjangoJSONEncoder)
-            else:
-                value = str(value)
-            return bool(self.redis_client.sismember(name, value))
+            return bool(self.redis_client.sismember(name, self._encode(value)))
         except Exception as e:
             logger.error(f"Redis SISMEMBER error for set {name}: {e}")
             return False
 
+    # Event Snapshots
+    def set_event_snapshot(
+        self, key: str, data: Dict[str, Any], ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Store serialized event data as a hash at key, one field per top-level
+        value, with its ticket types in a second hash (see ticket_types_key).
+        Readers can then fetch just the fields they need with
+        get_event_fields. Replaces any previous snapshot atomically.
+
+        key must contain the event's hash tag, so both hashes share a slot.
+        """
+        with self.pipeline(transaction=True) as pipe:
+            pipe.set_event_snapshot(key, data, ttl)
+        return all(result is not None for result in pipe.results)
+
+    def get_event_snapshot(self, key: str) -> Optional[Dict[str, Any]]:
+        """The whole event stored at key, or None if there is no snapshot"""
+        with self.pipeline() as pipe:
+            pipe.hgetall(key)
+            pipe.hgetall(ticket_types_key(key))
+        fields, ticket_types = pipe.results
+        self.metrics.record_lookup(key, bool(fields))
+        if not fields:
+            return None
+        return join_event_snapshot(fields, ticket_types or {})
+
+    def get_event_fields(
+        self,
+        key: str,
+        fields: List[str],
+        ticket_types: Union[bool, List[Any]] = False,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Project fields of the event snapshot at key with a single HMGET,
+        without decoding the rest. With ticket_types set, the ticket types
+        (all, or only the given ids) come along as "ticket_types" in the
+        same round trip.
+
+        Returns:
+            The requested fields that exist, or None if there is no snapshot
+        """
+        with self.pipeline() as pipe:
+            pipe.hmget(key, fields)
+            if ticket_types is True:
+                pipe.hgetall(ticket_types_key(key))
+            elif ticket_types:
+                pipe.hmget(ticket_types_key(key), [str(i) for i in ticket_types])
+
+        values = pipe.results[0] or []
+        hit = any(value is not None for value in values)
+        self.metrics.record_lookup(key, hit)
+        if not hit:
+            return None
+
+        result = {
+            field: value for field, value in zip(fields, values) if value is not None
+        }
+        if ticket_types is True:
+            result["ticket_types"] = join_event_snapshot({}, pipe.results[1] or {})[
+                "ticket_types"
+            ]
+        elif ticket_types:
+            result["ticket_types"] = [t for t in pipe.results[1] or [] if t is not None]
+        return result
+
+    def update_event_fields(self, key: str, mapping: Dict[str, Any]) -> bool:
+        """
+        Overwrite some fields of the event snapshot at key. Does nothing
+        (returns False) when there is no snapshot to update.
+        """
+        return self._update_event_hash(key, key, mapping)
+
+    def update_event_ticket_types(
+        self, key: str, ticket_types: Dict[Any, Dict[str, Any]]
+    ) -> bool:
+        """
+        Add or overwrite ticket types, by id, of the event snapshot at key.
+        Does nothing (returns False) when there is no snapshot to update.
+        """
+        return self._update_event_hash(key, ticket_types_key(key), ticket_types)
+
+    def _update_event_hash(self, key: str, name: str, mapping: Dict[Any, Any]) -> bool:
+        if not mapping:
+            return False
+        args = []
+        for field, value in mapping.items():
+            args.extend((str(field), self._encode(value)))
+        try:
+            return bool(
+                self._run_script(
+                    redis_scripts.HSET_IF_EXISTS, keys=[key, name], args=args
+                )
+            )
+        except Exception as e:
+            logger.error(f"Redis snapshot update error for {name}: {e}")
+            return False
+
+    def delete_event_snapshot(self, key: str) -> bool:
+        """Remove the event snapshot at key"""
+        return bool(self.delete(key, ticket_types_key(key)))
+
+    # Inventory Operations
+    def set_inventory(
+        self,
+        event_id: Any,
+        counts: Dict[Any, int],
+        ttl: Optional[int] = None,
+        replace: bool = True,
+        limits: Optional[Dict[Any, int]] = None,
+    ) -> bool:
+        """
+        Store remaining stock for an event's ticket types
+
+        Args:
+            event_id: Event the counters belong to
+            counts: Remaining quantity keyed by ticket type id
+            ttl: Optional time to live in seconds
+            replace: Drop ticket types that are not in counts
+            limits: Optional per-person limit keyed by ticket type id
+        """
+        key = inventory_key(event_id)
+        limits_key = inventory_limits_key(event_id)
+        try:
+            pipe = self.redis_client.pipeline(transaction=True)
+            if replace:
+                pipe.delete(key, limits_key)
+            if counts:
+                pipe.hset(key, mapping={str(k): int(v) for k, v in counts.items()})
+            if limits:
+                pipe.hset(
+                    limits_key, mapping={str(k): int(v) for k, v in limits.items()}
+                )
+            if ttl:
+                pipe.expire(key, ttl)
+                pipe.expire(limits_key, ttl)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis inventory SET error for event {event_id}: {e}")
+            return False
+
+    def seed_inventory(
+        self,
+        event_id: Any,
+        counts: Dict[Any, int],
+        limits: Optional[Dict[Any, int]] = None,
+    ) -> bool:
+        """
+        Add counters for ticket types that are not tracked yet, leaving
+        existing ones (and any reservations made against them) untouched
+        """
+        try:
+            pipe = self.redis_client.pipeline(transaction=True)
+            for ticket_type_id, count in counts.items():
+                pipe.hsetnx(inventory_key(event_id), str(ticket_type_id), int(count))
+            for ticket_type_id, limit in (limits or {}).items():
+                pipe.hsetnx(
+                    inventory_limits_key(event_id), str(ticket_type_id), int(limit)
+                )
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis inventory SEED error for event {event_id}: {e}")
+            return False
+
+    def get_inventory(self, event_id: Any) -> Dict[str, int]:
+        """Get remaining stock keyed by ticket type id in a single HGETALL"""
+        key = inventory_key(event_id)
+        try:
+            return {_text(k): int(v) for k, v in self.redis_client.hgetall(key).items()}
+        except Exception as e:
+            logger.error(f"Redis inventory GET error for event {event_id}: {e}")
+            return {}
+
+    def adjust_inventory(
+        self, event_id: Any, ticket_type_id: Any, amount: int
+    ) -> Optional[int]:
+        """Add amount (negative to remove) to a ticket type's remaining stock"""
+        key = inventory_key(event_id)
+        try:
+            return self.redis_client.hincrby(key, str(ticket_type_id), amount)
+        except Exception as e:
+            logger.error(
+                f"Redis inventory HINCRBY error for event {event_id}, "
+                f"ticket type {ticket_type_id}: {e}"
+            )
+            return None
+
+    def delete_inventory(self, event_id: Any) -> bool:
+        """Delete all stock counters of an event"""
+        return bool(
+            self.delete(inventory_key(event_id), inventory_limits_key(event_id))
+        )
+
+    @staticmethod
+    def _reservation_args(quantities: Dict[Any, int]) -> Tuple[List[Any], Any]:
+        """
+        Script arguments for quantities, and the first ticket type whose
+        quantity is not a positive integer (None when all are valid)
+        """
+        args = []
+        for ticket_type_id, quantity in quantities.items():
+            if (
+                isinstance(quantity, bool)
+                or not isinstance(quantity, int)
+                or quantity <= 0
+            ):
+                return [], ticket_type_id
+            args.extend([str(ticket_type_id), quantity])
+        return args, None
+
+    def reserve(
+        self, event_id: Any, quantities: Dict[Any, int], user_id: Any
+    ) -> Dict[str, Any]:
+        """
+        Atomically take stock for several ticket types in one round trip.
+        Every quantity is checked against remaining stock and the ticket
+        type's per-person limit first; nothing is taken unless all pass.
+
+        Args:
+            event_id: Event being booked
+            quantities: Quantity to reserve keyed by ticket type id, each a
+                positive integer
+            user_id: User the per-person limits are enforced for
+
+        Returns:
+            Dict with 'success', plus 'reason', 'ticket_type' and 'available'
+            describing the first ticket type that failed
+        """
+        args, invalid = self._reservation_args(quantities)
+        if invalid is not None or not args:
+            return {
+                "success": False,
+                "reason": "invalid_quantity",
+                "ticket_type": None if invalid is None else str(invalid),
+                "available": 0,
+            }
+
+        try:
+            result = self._run_script(
+                redis_scripts.RESERVE,
+                keys=[
+                    inventory_key(event_id),
+                    inventory_limits_key(event_id),
+                    inventory_holds_key(event_id, user_id),
+                ],
+                args=args,
+            )
+        except Exception as e:
+            logger.error(f"Redis RESERVE error for event {event_id}: {e}")
+            return {"success": False, "reason": "unavailable"}
+
+        if result[0] == 1:
+            return {"success": True}
+        return {
+            "success": False,
+            "reason": _text(result[1]),
+            "ticket_type": _text(result[2]),
+            "available": int(result[3]),
+        }
+
+    def release(self, event_id: Any, quantities: Dict[Any, int], user_id: Any) -> bool:
+        """
+        Give back stock taken by reserve() and lower the user's holds. At
+        most what the user holds is released, so repeating a release never
+        adds stock. False if a quantity is not a positive integer.
+        """
+        args, invalid = self._reservation_args(quantities)
+        if invalid is not None:
+            logger.error(
+                f"Redis RELEASE for event {event_id} rejected: invalid quantity "
+                f"for ticket type {invalid}"
+            )
+            return False
+        if not args:
+            return True
+
+        try:
+            released = self._run_script(
+                redis_scripts.RELEASE,
+                keys=[
+                    inventory_key(event_id),
+                    inventory_limits_key(event_id),
+                    inventory_holds_key(event_id, user_id),
+                ],
+                args=args,
+            )
+            return released >= 0
+        except Exception as e:
+            logger.error(f"Redis RELEASE error for event {event_id}: {e}")
+            return False
+
+    # Local Cache Tier
+    @property
+    def local_cache(self) -> Optional[LocalCache]:
+        """
+        In-process LRU in front of the cache: namespace, or None when
+        REDIS_LOCAL_CACHE_SIZE is 0. Entries are kept encoded so callers
+        never share mutable objects.
+        """
+        max_size = int(_setting("REDIS_LOCAL_CACHE_SIZE", 1024))
+        if self._local_cache is None and max_size > 0:
+            with self._lock:
+                if self._local_cache is None:
+                    self._local_cache = LocalCache(
+                        max_size=max_size,
+                        ttl=float(_setting("REDIS_LOCAL_CACHE_TTL", 5)),
+                    )
+        return self._local_cache
+
+    def _ensure_invalidation_listener(self):
+        """Start the pub/sub listener thread for this process if needed"""
+        if self._listener is not None and self._listener.is_alive():
+            return
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(
+                    target=self._listen_for_invalidations,
+                    name="redis-cache-invalidation",
+                    daemon=True,
+                )
+                self._listener.start()
+
+    def _listen_for_invalidations(self):
+        """Evict local entries announced on the invalidation channel"""
+        backoff = 1
+        while True:
+            pubsub = None
+            try:
+                pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+                # Anything published while we were not subscribed was missed
+                if self._local_cache is not None:
+                    self._local_cache.clear()
+                backoff = 1
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message["type"] == "message":
+                        self._handle_invalidation(message["data"])
+            except Exception as e:
+                logger.error(f"Redis cache invalidation listener error: {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def _handle_invalidation(self, data: Any):
+        origin, _, key = _text(data).partition(":")
+        if origin != self._origin and self._local_cache is not None:
+            self._local_cache.delete(key)
+
+    def evict_local(self, key: str):
+        """Drop this process's local copy of key, if it has one"""
+        if self._local_cache is not None:
+            self._local_cache.delete(key)
+
+    def _publish_invalidation(self, key: str):
+        """Tell the other workers to drop their local copy of key"""
+        if self.local_cache is None:
+            return
+        try:
+            self.redis_client.publish(
+                CACHE_INVALIDATION_CHANNEL, f"{self._origin}:{key}"
+            )
+        except Exception as e:
+            logger.error(f"Redis PUBLISH error for key {key}: {e}")
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the local and Redis cache tiers"""
+        local = self._local_cache.stats() if self._local_cache is not None else {}
+        return {
+            "local": local,
+            "redis": {
+                "hits": self.cache_redis_hits,
+                "misses": self.cache_redis_misses,
+            },
+        }
+
     # Cache Operations
     def cache_set(self, key: str, value: Any, timeout: int = 3600) -> bool:
         """Cache a value with timeout (default 1 hour)"""
-        cache_key = f"cache:{key}"
-        return self.set(cache_key, value, timeout)
+        full_key = cache_key(key)
+        try:
+            data = self._encode(value)
+            stored = self.redis_client.setex(full_key, timeout, data)
+        except Exception as e:
+            logger.error(f"Redis SET error for key {full_key}: {e}")
+            return False
+
+        local = self.local_cache
+        if local is not None:
+            self._ensure_invalidation_listener()
+            local.set(full_key, data, ttl=min(local.ttl, timeout))
+            self._publish_invalidation(full_key)
+        return stored
 
     def cache_get(self, key: str, default: Any = None) -> Any:
-        """Get cached value"""
-        cache_key = f"cache:{key}"
-        return self.get(cache_key, default)
+        """Get cached value, trying the in-process tier before Redis"""
+        value = self._cache_get_raw(key)
+        return default if value is None else unwrap_cached(value)
+
+    def _cache_get_raw(self, key: str) -> Any:
+        """Cached value as stored, including any cache_get_or_set envelope"""
+        full_key = cache_key(key)
+        local = self.local_cache
+        try:
+            if local is not None:
+                self._ensure_invalidation_listener()
+                found, data = local.get(full_key)
+                if found:
+                    self.metrics.record_lookup(full_key, True)
+                    return self._decode(data)
+
+            data = self.redis_client.get(full_key)
+            self.metrics.record_lookup(full_key, data is not None)
+            if data is None:
+                self.cache_redis_misses += 1
+                return None
+            self.cache_redis_hits += 1
+
+            if local is not None:
+                local.set(full_key, data)
+            return self._decode(data)
+        except Exception as e:
+            logger.error(f"Redis GET error for key {full_key}: {e}")
+            return None
 
     def cache_delete(self, key: str) -> bool:
-        """Delete cached value"""
-        cache_key = f"cache:{key}"
-        return bool(self.delete(cache_key))
+        """Delete cached value here, in Redis and in every other worker"""
+        full_key = cache_key(key)
+        if self._local_cache is not None:
+            self._local_cache.delete(full_key)
+        deleted = bool(self.delete(full_key))
+        self._publish_invalidation(full_key)
+        return deleted
+
+    def tag_generations(self, tags: List[str]) -> Dict[str, int]:
+        """Current generation of each tag (0 for tags never invalidated)"""
+        values = self.mget([cache_tag_key(tag) for tag in tags], default=0)
+        return {tag: int(value) for tag, value in zip(tags, values)}
+
+    def cache_set_tagged(
+        self,
+        key: str,
+        value: Any,
+        tags: List[str],
+        timeout: int = 3600,
+        generations: Optional[Dict[str, int]] = None,
+    ) -> bool:
+        """
+        Cache value under key along with the generation of each tag. Once
+        any of those tags is invalidated the entry reads as a miss and is
+        left to expire, so invalidating never has to find the keys.
+
+        generations should be read with tag_generations before value was
+        computed; when left out they are read now, which stores a value
+        computed before a concurrent invalidation as current.
+        """
+        if generations is None:
+            generations = self.tag_generations(list(tags))
+        envelope = {
+            TAGGED_ENVELOPE: True,
+            "value": value,
+            "tags": {tag: generations.get(tag, 0) for tag in tags},
+        }
+        return self.cache_set(key, envelope, timeout)
 
-    def cache_get_or_set(self, key: str, callable_func, timeout: int = 3600) -> Any:
-        """Get from cache or set if not exists"""
-        cache_key = f"cache:{key}"
-        cached_value = self.get(cache_key)
+    def cache_get_tagged(self, key: str, default: Any = None) -> Any:
+        """
+        Cached value of key, or default if it is missing or one of its tags
+        was invalidated since it was stored
+        """
+        entry = self.cache_get(key)
+        if not (isinstance(entry, dict) and entry.get(TAGGED_ENVELOPE)):
+            return default if entry is None else entry
+        stored = entry["tags"]
+        if stored and self.tag_generations(list(stored)) != stored:
+            return default
+        return entry["value"]
+
+    def invalidate_tags(self, *tags: str) -> bool:
+        """Invalidate every entry cached with any of tags, one INCR per tag"""
+        if not tags:
+            return False
+        with self.pipeline() as pipe:
+            for tag in tags:
+                pipe.incr(cache_tag_key(tag))
+        return all(result is not None for result in pipe.results)
+
+    def cache_get_or_set(
+        self,
+        key: str,
+        callable_func,
+        timeout: int = 3600,
+        stale_ttl: int = 60,
+        lock_timeout: int = 10,
+        early_refresh: float = 0.0,
+    ) -> Any:
+        """
+        Get from cache or set if not exists, without dogpiling
 
-        if cached_value is not None:
-            return cached_value
+        Only the worker holding a short Redis lock recomputes an entry. While
+        it does, other callers are served the previous value for up to
+        stale_ttl seconds after it expired, or wait for the new one when
+        there is nothing to serve.
+
+        Args:
+            key: Cache key
+            callable_func: Computes the value on a miss
+            timeout: Seconds the value is considered fresh
+            stale_ttl: Extra seconds an expired value may still be served
+            lock_timeout: Seconds the recompute lock (and any wait) lasts
+            early_refresh: Beta of probabilistic early expiration; above 0,
+                callers occasionally refresh shortly before expiry, weighted
+                by how long the value took to compute (1.0 is a good start)
+        """
+        entry = self._cache_get_raw(key)
+
+        if entry is not None:
+            if not (isinstance(entry, dict) and entry.get(CACHE_ENVELOPE)):
+                return entry
+
+            remaining = entry["expires_at"] - time.time()
+            if early_refresh > 0 and remaining > 0:
+                # XFetch: refresh early with a probability that grows near expiry
+                remaining += entry["delta"] * early_refresh * math.log(random.random())
+            if remaining > 0:
+                return entry["value"]
+
+            token = self._acquire_cache_lock(key, lock_timeout)
+            if token is None:
+                return entry["value"]
+            try:
+                return self._recompute(key, callable_func, timeout, stale_ttl)
+            finally:
+                self._release_cache_lock(key, token)
+
+        token = self._acquire_cache_lock(key, lock_timeout)
+        if token is None:
+            # Someone else is computing it; wait for their result
+            deadline = time.monotonic() + lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                entry = self._cache_get_raw(key)
+                if entry is not None:
+                    return unwrap_cached(entry)
+            return callable_func()
+
+        try:
+            return self._recompute(key, callable_func, timeout, stale_ttl)
+        finally:
+            self._release_cache_lock(key, token)
 
-        # Get fresh value
+    def _recompute(self, key: str, callable_func, timeout: int, stale_ttl: int) -> Any:
+        started = time.monotonic()
         fresh_value = callable_func()
-        self.set(cache_key, fresh_value, timeout)
+        envelope = {
+            CACHE_ENVELOPE: True,
+            "value": fresh_value,
+            "expires_at": time.time() + timeout,
+            "delta": time.monotonic() - started,
+        }
+        self.cache_set(key, envelope, timeout + stale_ttl)
         return fresh_value
 
+    def _acquire_cache_lock(self, key: str, lock_timeout: int) -> Optional[str]:
+        """Token if this caller should recompute key, None if another one is"""
+        token = uuid.uuid4().hex
+        try:
+            acquired = self.redis_client.set(
+                cache_lock_key(key), token, nx=True, ex=lock_timeout
+            )
+        except Exception as e:
+            # Without Redis there is nothing to coordinate with
+            logger.error(f"Redis cache lock error for key {key}: {e}")
+            return token
+        return token if acquired else None
+
+    def _release_cache_lock(self, key: str, token: str):
+        try:
+            self._run_script(
+                redis_scripts.COMPARE_AND_DELETE,
+                keys=[cache_lock_key(key)],
+                args=[token],
+            )
+        except Exception as e:
+            logger.error(f"Redis cache unlock error for key {key}: {e}")
+
+    # Locks
+    def lock(
+        self, name: str, timeout: float = 10, blocking_timeout: Optional[float] = None
+    ) -> RedisLock:
+        """
+        Distributed lock on name that expires after timeout seconds unless
+        extended. Used as a context manager it waits up to blocking_timeout
+        seconds (forever when None) and raises LockError if it gives up, or
+        LockUnavailableError if Redis fails.
+        """
+        return RedisLock(self, name, timeout, blocking_timeout)
+
+    # Bloom Filters
+    def _bloom_offsets(self, item: Any) -> List[int]:
+        return bloom_offsets(
+            item,
+            int(_setting("REDIS_BLOOM_SIZE", 8388608)),
+            int(_setting("REDIS_BLOOM_HASHES", 7)),
+        )
+
+    def bloom_add(self, name: str, *items: Any) -> bool:
+        """
+        Add items to an existing Bloom filter. Does nothing (returns False)
+        when the filter has not been built yet, see bloom_rebuild.
+        """
+        offsets = [offset for item in items for offset in self._bloom_offsets(item)]
+        if not offsets:
+            return False
+        try:
+            return bool(
+                self._run_script(
+                    redis_scripts.BLOOM_ADD, keys=[bloom_key(name)], args=offsets
+                )
+            )
+        except Exception as e:
+            logger.error(f"Redis bloom add error for {name}: {e}")
+            return False
+
+    def bloom_contains(self, name: str, item: Any) -> Optional[bool]:
+        """
+        Whether item may be in a Bloom filter: False means it definitely is
+        not, True that it probably is. None when the filter does not exist
+        or Redis is unavailable, in which case callers should not rely on it.
+        """
+        try:
+            result = self._run_script(
+                redis_scripts.BLOOM_CHECK,
+                keys=[bloom_key(name)],
+                args=self._bloom_offsets(item),
+            )
+        except Exception as e:
+            logger.error(f"Redis bloom check error for {name}: {e}")
+            return None
+        if result == -1:
+            return None
+        self.metrics.record_lookup(bloom_key(name), bool(result))
+        return bool(result)
+
+    def bloom_rebuild(
+        self, name: str, items: Iterable[Any], batch_size: int = 5000
+    ) -> int:
+        """
+        Build a Bloom filter from scratch into a temporary key and swap it in
+        with RENAME, so readers never see a partial filter. Bits cannot be
+        cleared from a Bloom filter, so this is also how removed items go.
+
+        Returns:
+            Number of items added, or -1 on error
+        """
+        size = int(_setting("REDIS_BLOOM_SIZE", 8388608))
+        key = bloom_key(name)
+        tmp_key = f"{key}:rebuild:{uuid.uuid4().hex}"
+        count = 0
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            # Allocate the whole bitmap up front, so an empty filter exists too
+            pipe.setbit(tmp_key, size - 1, 0)
+            for item in items:
+                for offset in self._bloom_offsets(item):
+                    pipe.setbit(tmp_key, offset, 1)
+                count += 1
+                if count % batch_size == 0:
+                    pipe.execute()
+            pipe.rename(tmp_key, key)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Redis bloom rebuild error for {name}: {e}")
+            try:
+                self.redis_client.delete(tmp_key)
+            except Exception:
+                pass
+            return -1
+        return count
+
     # Session Operations
     def set_session(
         self, session_id: str, user_id: int, data: Dict[str, Any], ttl: int = 86400
     ) -> bool:
         """Set user session data (default 24 hours)"""
-        session_key = f"session:{session_id}"
         session_data = {
             "user_id": user_id,
             "data": data,
             "created_at": json.dumps(timezone.now(), cls=DjangoJSONEncoder),
         }
-        return self.set(session_key, session_data, ttl)
+        return self.set(session_key(session_id), session_data, ttl)
 
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get user session data"""
-        session_key = f"session:{session_id}"
-        return self.get(session_key)
+        return self.get(session_key(session_id))
 
     def delete_session(self, session_id: str) -> bool:
         """Delete user session"""
-        session_key = f"session:{session_id}"
-        return bool(self.delete(session_key))
+        return bool(self.delete(session_key(session_id)))
 
     # Rate Limiting
     def rate_limit_check(
-        self, identifier: str, limit: int, window: int
+        self, identifier: str, limit: int, window: int, cost: int = 1
     ) -> Dict[str, Any]:
         """
         Check rate limit for identifier
 
+        Uses GCRA in a single script call: `limit` requests are allowed per
+        `window`, spread evenly but with bursts of up to `limit`. Only one
+        timestamp is stored per identifier.
+
         Args:
             identifier: Unique identifier (user_id, IP, etc.)
             limit: Number of requests allowed
             window: Time window in seconds
+            cost: Number of requests this call counts as
 
         Returns:
-            Dict with 'allowed', 'remaining', 'reset_time'
+            Dict with 'allowed', 'remaining', 'retry_after' (seconds until
+            the call would be allowed) and 'reset_time' (when the limit is
+            fully replenished)
         """
-        key = f"rate_limit:{identifier}"
-        current_time = int(time.time())
+        key = rate_limit_key(identifier)
+        now = time.time()
 
         try:
-            pipe = self.redis_client.pipeline()
-            pipe.zremrangebyscore(key, 0, current_time - window)
-            pipe.zcard(key)
-            pipe.zadd(key, {current_time: current_time})
-            pipe.expire(key, window)
-            results = pipe.execute()
-
-            current_requests = results[1]
-
-            if current_requests < limit:
-                return {
-                    "allowed": True,
-                    "remaining": limit - current_requests - 1,
-                    "reset_time": current_time + window,
-                }
-            else:
-                # Remove the request we just added since it's over limit
-                self.redis_client.zrem(key, current_time)
-                return {
-                    "allowed": False,
-                    "remaining": 0,
-                    "reset_time": current_time + window,
-                }
+            allowed, remaining, retry_after, reset_after = self._run_script(
+                redis_scripts.GCRA, [key], [limit, window, cost]
+            )
+            return {
+                "allowed": bool(allowed),
+                "remaining": remaining,
+                "retry_after": retry_after / 1000,
+                "reset_time": int(now + reset_after / 1000),
+            }
 
         except Exception as e:
             logger.error(f"Rate limit check error for {identifier}: {e}")
             return {
                 "allowed": True,
                 "remaining": limit,
-                "reset_time": current_time + window,
+                "retry_after": 0,
+                "reset_time": int(now),
             }
 
+    # Streams
+    def stream_publish(
+        self, name: str, message: Dict[str, Any], maxlen: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Append a message to a stream, trimming it to about maxlen entries
+        (the REDIS_STREAM_MAXLEN setting when not given)
+
+        Returns:
+            The message id, or None on error
+        """
+        key = stream_key(name)
+        if maxlen is None:
+            maxlen = int(_setting("REDIS_STREAM_MAXLEN", 10000))
+        try:
+            fields = {field: self._encode(value) for field, value in message.items()}
+            return _text(
+                self.redis_client.xadd(key, fields, maxlen=maxlen, approximate=True)
+            )
+        except Exception as e:
+            logger.error(f"Redis XADD error for stream {key}: {e}")
+            return None
+
+    def stream_create_group(self, name: str, group: str, start_id: str = "$") -> bool:
+        """
+        Create a consumer group, and the stream if needed. start_id "$" only
+        delivers messages published from now on, "0" the whole stream.
+        """
+        key = stream_key(name)
+        try:
+            self.redis_client.xgroup_create(key, group, id=start_id, mkstream=True)
+            return True
+        except redis.ResponseError as e:
+            if "BUSYGROUP" in str(e):
+                return True
+            logger.error(f"Redis XGROUP CREATE error for stream {key}: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Redis XGROUP CREATE error for stream {key}: {e}")
+            return False
+
+    def _stream_messages(self, entries: Any) -> List[Tuple[str, Dict[str, Any]]]:
+        return [
+            (
+                _text(message_id),
+                {_text(k): self._decode(v) for k, v in (fields or {}).items()},
+            )
+            for message_id, fields in entries
+        ]
+
+    def stream_read(
+        self,
+        name: str,
+        group: str,
+        consumer: str,
+        count: int = 100,
+        block: Optional[int] = 5000,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Read up to count new messages for a consumer of a group, waiting up
+        to block milliseconds for the first one. Messages stay pending until
+        acknowledged with stream_ack.
+
+        Returns:
+            List of (message id, message) tuples
+        """
+        key = stream_key(name)
+        try:
+            response = self.redis_client.xreadgroup(
+                group, consumer, {key: ">"}, count=count, block=block
+            )
+        except Exception as e:
+            logger.error(f"Redis XREADGROUP error for stream {key}: {e}")
+            return []
+
+        messages = []
+        for _, entries in response or []:
+            messages.extend(self._stream_messages(entries))
+        return messages
+
+    def stream_claim(
+        self,
+        name: str,
+        group: str,
+        consumer: str,
+        min_idle_ms: int = 60000,
+        count: int = 100,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Take over messages another consumer read but did not acknowledge
+        within min_idle_ms, e.g. because it crashed
+        """
+        key = stream_key(name)
+        try:
+            response = self.redis_client.xautoclaim(
+                key, group, consumer, min_idle_ms, start_id="0-0", count=count
+            )
+            return self._stream_messages(
+                entry for entry in response[1] if entry[1] is not None
+            )
+        except Exception as e:
+            logger.error(f"Redis XAUTOCLAIM error for stream {key}: {e}")
+            return []
+
+    def stream_ack(self, name: str, group: str, *message_ids: str) -> int:
+        """Acknowledge processed messages"""
+        if not message_ids:
+            return 0
+        key = stream_key(name)
+        try:
+            return self.redis_client.xack(key, group, *message_ids)
+        except Exception as e:
+            logger.error(f"Redis XACK error for stream {key}: {e}")
+            return 0
+
+    def stream_trim(self, name: str, maxlen: int) -> int:
+        """Trim a stream to about maxlen entries"""
+        key = stream_key(name)
+        try:
+            return self.redis_client.xtrim(key, maxlen=maxlen, approximate=True)
+        except Exception as e:
+            logger.error(f"Redis XTRIM error for stream {key}: {e}")
+            return 0
+
     # Utility Methods
     def flush_all(self) -> bool:
         """Flush all Redis data (use with caution!)"""
@@ -438,13 +2057,21 @@ class RedisClient:
             logger.error(f"Redis FLUSHALL error: {e}")
             return False
 
-    def get_keys(self, pattern: str = "*") -> List[str]:
-        """Get keys matching pattern"""
+    def scan_iter(self, pattern: str = "*", count: int = 500) -> Iterator[str]:
+        """
+        Iterate over keys matching pattern using SCAN cursors, so Redis is
+        never blocked the way KEYS blocks it. Meant for admin/maintenance
+        use; keys may be returned more than once.
+        """
         try:
-            return self.redis_client.keys(pattern)
+            for key in self.redis_client.scan_iter(match=pattern, count=count):
+                yield _text(key)
         except Exception as e:
-            logger.error(f"Redis KEYS error for pattern {pattern}: {e}")
-            return []
+            logger.error(f"Redis SCAN error for pattern {pattern}: {e}")
+
+    def get_keys(self, pattern: str = "*") -> List[str]:
+        """Get keys matching pattern (SCAN based, see scan_iter)"""
+        return list(dict.fromkeys(self.scan_iter(pattern)))
 
     def get_info(self) -> Dict[str, Any]:
         """Get Redis server info"""
@@ -464,16 +2091,14 @@ def cache_view_data(
     view_name: str, params: Dict[str, Any], data: Any, timeout: int = 3600
 ) -> bool:
     """Cache view data with automatic key generation"""
-    cache_key = f"view:{view_name}:{hash(str(sorted(params.items())))}"
-    return redis_client.cache_set(cache_key, data, timeout)
+    return redis_client.cache_set(view_cache_key(view_name, params), data, timeout)
 
 
 def get_cached_view_data(
     view_name: str, params: Dict[str, Any], default: Any = None
 ) -> Any:
     """Get cached view data"""
-    cache_key = f"view:{view_name}:{hash(str(sorted(params.items())))}"
-    return redis_client.cache_get(cache_key, default)
+    return redis_client.cache_get(view_cache_key(view_name, params), default)
 
 
 def cache_queryset(
@@ -488,11 +2113,3 @@ def get_cached_queryset(queryset_key: str, default: List = None) -> List[Dict]:
     if default is None:
         default = []
     return redis_client.cache_get(f"queryset:{queryset_key}", default)
-
-
-# Import required modules for session operations
-try:
-    from django.utils import timezone
-    import time
-except ImportError:
-    pass
@@ -0,0 +1,186 @@
+"""
+Lua scripts run server-side by RedisClient.
+
+Each script touches only keys passed in KEYS, so it stays valid wherever
+those keys live.
+"""
+
+# Reserve several ticket types at once, all-or-nothing.
+#
+# KEYS[1] inventory hash (ticket type -> remaining)
+# KEYS[2] per-person limit hash (ticket type -> limit)
+# KEYS[3] the user's holds hash (ticket type -> quantity already held)
+# ARGV    ticket type, quantity, ticket type, quantity, ...
+#
+# Returns {1} on success, or {0, reason, ticket type, available} on failure.
+# Quantities must be positive integers.
+RESERVE = """
+for i = 1, #ARGV, 2 do
+    local ticket_type = ARGV[i]
+    local quantity = tonumber(ARGV[i + 1])
+    if not quantity or quantity <= 0 or quantity % 1 ~= 0 then
+        return {0, 'invalid_quantity', ticket_type, 0}
+    end
+    local remaining = redis.call('HGET', KEYS[1], ticket_type)
+    if not remaining then
+        return {0, 'unknown_ticket_type', ticket_type, 0}
+    end
+    remaining = tonumber(remaining)
+    if remaining < quantity then
+        return {0, 'insufficient_stock', ticket_type, remaining}
+    end
+    local limit = redis.call('HGET', KEYS[2], ticket_type)
+    if limit then
+        local held = tonumber(redis.call('HGET', KEYS[3], ticket_type) or '0')
+        if held + quantity > tonumber(limit) then
+            return {0, 'per_person_limit', ticket_type, math.max(0, tonumber(limit) - held)}
+        end
+    end
+end
+for i = 1, #ARGV, 2 do
+    redis.call('HINCRBY', KEYS[1], ARGV[i], -tonumber(ARGV[i + 1]))
+    redis.call('HINCRBY', KEYS[3], ARGV[i], tonumber(ARGV[i + 1]))
+end
+return {1}
+"""
+
+# Give reserved tickets back.
+#
+# KEYS and ARGV as for RESERVE. Only what the user still holds is given back,
+# so releasing twice, or more than was reserved, cannot add stock. Stock is
+# only returned for ticket types that are still tracked.
+#
+# Returns the total quantity released, or -1 (changing nothing) if a
+# quantity is not a positive integer.
+RELEASE = """
+for i = 1, #ARGV, 2 do
+    local quantity = tonumber(ARGV[i + 1])
+    if not quantity or quantity <= 0 or quantity % 1 ~= 0 then
+        return -1
+    end
+end
+local released = 0
+for i = 1, #ARGV, 2 do
+    local ticket_type = ARGV[i]
+    local held = tonumber(redis.call('HGET', KEYS[3], ticket_type) or '0')
+    local quantity = math.min(tonumber(ARGV[i + 1]), held)
+    if quantity > 0 then
+        if redis.call('HEXISTS', KEYS[1], ticket_type) == 1 then
+            redis.call('HINCRBY', KEYS[1], ticket_type, quantity)
+        end
+        if held == quantity then
+            redis.call('HDEL', KEYS[3], ticket_type)
+        else
+            redis.call('HINCRBY', KEYS[3], ticket_type, -quantity)
+        end
+        released = released + quantity
+    end
+end
+return released
+"""
+
+# Delete a key only if it still holds the caller's token.
+#
+# KEYS[1] key
+# ARGV[1] token
+COMPARE_AND_DELETE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# GCRA rate limiter: allow `limit` requests per `period`, with bursts of up to
+# `limit`. Only the theoretical arrival time (TAT) of the next request is
+# stored, as milliseconds on the Redis clock.
+#
+# KEYS[1] rate limit key
+# ARGV[1] limit
+# ARGV[2] period in seconds
+# ARGV[3] cost of this request
+#
+# Returns {allowed, remaining, retry after ms, reset after ms}.
+GCRA = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2]) * 1000
+local cost = tonumber(ARGV[3])
+local interval = period / limit
+
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval * cost
+local allow_at = new_tat - period
+if allow_at > now then
+    return {0, 0, math.ceil(allow_at - now), math.ceil(tat - now)}
+end
+redis.call('SET', KEYS[1], string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now))
+return {1, math.floor((now - allow_at) / interval), 0, math.ceil(new_tat - now)}
+"""
+
+# Reset the expiry of a key only if it still holds the caller's token.
+#
+# KEYS[1] key
+# ARGV[1] token
+# ARGV[2] new time to live in milliseconds
+COMPARE_AND_PEXPIRE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Set bits of a Bloom filter, but only in a filter that was built already.
+# Adding to a missing filter would create one that lacks every other item.
+#
+# KEYS[1] filter bitmap
+# ARGV    bit offsets
+#
+# Returns 1 if the bits were set, 0 if the filter does not exist.
+BLOOM_ADD = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for i = 1, #ARGV do
+    redis.call('SETBIT', KEYS[1], ARGV[i], 1)
+end
+return 1
+"""
+
+# Check the bits of one item in a Bloom filter.
+#
+# KEYS[1] filter bitmap
+# ARGV    bit offsets
+#
+# Returns 1 if every bit is set (maybe present), 0 if one is not (absent),
+# -1 if the filter does not exist.
+BLOOM_CHECK = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+for i = 1, #ARGV do
+    if redis.call('GETBIT', KEYS[1], ARGV[i]) == 0 then
+        return 0
+    end
+end
+return 1
+"""
+
+# Set hash fields only while a snapshot exists, so a partial update never
+# recreates an expired or deleted snapshot with just the changed fields.
+#
+# KEYS[1] snapshot hash that must exist
+# KEYS[2] hash to write (may be KEYS[1])
+# ARGV    field, value, field, value, ...
+#
+# Returns 1 if the fields were set, 0 if the snapshot does not exist.
+HSET_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[2], unpack(ARGV))
+return 1
+"""
@@ -0,0 +1,121 @@
+import functools
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+from django.http import HttpRequest
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from utils.redis import redis_client, stable_digest, view_cache_key
+
+
+def _find_request(args) -> Optional[Request]:
+    """Request argument of a function view or a viewset method"""
+    for arg in args:
+        if isinstance(arg, (Request, HttpRequest)):
+            return arg
+    return None
+
+
+def _auth_scope(request: Request) -> str:
+    user = getattr(request, "user", None)
+    if user is not None and getattr(user, "is_authenticated", False):
+        return f"user:{getattr(user, 'id', None) or getattr(user, 'pk', '')}"
+    return "public"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the If-None-Match header of request matches etag"""
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return "*" in etags or etag in etags
+
+
+def _respond(request: Request, entry: Dict[str, Any]) -> Response:
+    if etag_matches(request, entry["etag"]):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(entry["data"], status=entry["status"])
+    response["ETag"] = entry["etag"]
+    return response
+
+
+def cache_response(
+    timeout: int = 60,
+    view_name: Optional[str] = None,
+    vary_on_user: bool = False,
+    tags: Union[Iterable[str], Callable[[Any], Iterable[str]], None] = None,
+) -> Callable:
+    """
+    Cache successful GET responses of a DRF view in Redis
+
+    Keys are built with view_cache_key from the view name, path kwargs and
+    query parameters, scoped to the authenticated user when vary_on_user is
+    set. The digest of the cached body doubles as the response ETag, so a
+    matching If-None-Match is answered with 304 without running the view.
+
+    tags, a list or a function of the view keyword arguments returning one,
+    ties the entry to cache tags: after RedisClient.invalidate_tags on any of
+    them the view runs again. Their generations are read before the view
+    runs, so an invalidation landing while it reads the database is not
+    stored as current.
+
+    Apply it below @api_view, or directly to viewset methods:
+
+        @api_view(["GET"])
+        @cache_response(timeout=30)
+        def my_view(request, event_id): ...
+    """
+
+    def decorator(view_func: Callable) -> Callable:
+        name = view_name or f"{view_func.__module__}.{view_func.__qualname__}"
+
+        @functools.wraps(view_func)
+        def wrapper(*args, **kwargs):
+            request = _find_request(args)
+            if request is None or request.method not in ("GET", "HEAD"):
+                return view_func(*args, **kwargs)
+
+            params = {
+                "kwargs": {k: str(v) for k, v in kwargs.items()},
+                "query": {k: sorted(v) for k, v in request.GET.lists()},
+            }
+            scope = _auth_scope(request) if vary_on_user else "public"
+            key = view_cache_key(name, params, scope=scope)
+
+            if tags is None:
+                entry = redis_client.cache_get(key)
+            else:
+                entry = redis_client.cache_get_tagged(key)
+            if entry is not None:
+                return _respond(request, entry)
+
+            if tags is not None:
+                entry_tags = list(tags(kwargs) if callable(tags) else tags)
+                generations = redis_client.tag_generations(entry_tags)
+            response = view_func(*args, **kwargs)
+            if response.status_code != status.HTTP_200_OK or not hasattr(
+                response, "data"
+            ):
+                return response
+
+            entry = {
+                "status": response.status_code,
+                "data": response.data,
+                "etag": f'"{stable_digest(response.data)}"',
+            }
+            if tags is None:
+                redis_client.cache_set(key, entry, timeout)
+            else:
+                redis_client.cache_set_tagged(
+                    key, entry, entry_tags, timeout, generations=generations
+                )
+            if etag_matches(request, entry["etag"]):
+                return _respond(request, entry)
+            response["ETag"] = entry["etag"]
+            return response
+
+        return wrapper
+
+    return decorator
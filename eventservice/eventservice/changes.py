@@ -0,0 +1,97 @@
+"""
+Publish event and ticket type changes to the event changes stream.
+
+Messages are sent once the surrounding transaction commits, so consumers
+never see a change that was rolled back. Each message has the fields:
+
+    entity    "event" or "ticket_type"
+    action    "created", "updated", "status_changed" or "deleted"
+    id        id of the changed object
+    event_id  id of the event it belongs to
+    data      serialized object (None when deleted)
+
+New event ids are also added to the Bloom filter of event ids, which other
+services check before asking for an event. Deleted ids stay in the filter
+until it is rebuilt with the rebuild_event_filter command.
+
+Every change also invalidates the cache tags of the event (see
+event_cache_tags), so cached responses built from it are recomputed.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+from django.db import transaction
+from utils.redis import EVENT_CHANGES_STREAM, EVENT_IDS_FILTER, redis_client
+from .serializers import EventSerializer, TicketTypeSerializer
+
+# Tag of every cached event listing
+EVENT_LIST_TAG = "events:list"
+
+
+def event_slug_tag(slug: str) -> str:
+    """Cache tag of responses looked up by event slug"""
+    return f"event:slug:{slug}"
+
+
+def event_cache_tags(
+    event_id: Any,
+    organization_id: Any = None,
+    venue_id: Any = None,
+    slugs: Iterable[str] = (),
+) -> List[str]:
+    """Cache tags of everything derived from an event"""
+    tags = [f"event:{event_id}", EVENT_LIST_TAG]
+    if organization_id is not None:
+        tags.append(f"organization:{organization_id}")
+    if venue_id is not None:
+        tags.append(f"venue:{venue_id}")
+    tags.extend(event_slug_tag(slug) for slug in slugs if slug)
+    return tags
+
+
+def publish_change(
+    entity: str,
+    action: str,
+    object_id: Any,
+    event_id: Any,
+    data: Optional[Dict[str, Any]] = None,
+    tags: Optional[List[str]] = None,
+):
+    """
+    Queue a change message, and the invalidation of tags, for when the
+    current transaction commits
+    """
+    message = {
+        "entity": entity,
+        "action": action,
+        "id": object_id,
+        "event_id": event_id,
+        "data": data,
+    }
+    transaction.on_commit(
+        lambda: redis_client.stream_publish(EVENT_CHANGES_STREAM, message)
+    )
+    if tags:
+        transaction.on_commit(lambda: redis_client.invalidate_tags(*tags))
+
+
+def publish_event_change(event, action: str, previous_slug: Optional[str] = None):
+    """
+    Publish an event, including its ticket types. Pass previous_slug when
+    the slug may have changed, so responses under the old one are dropped.
+    """
+    data = None if action == "deleted" else EventSerializer(event).data
+    if action == "created":
+        # Added right away: a rolled back id is only a false positive
+        redis_client.bloom_add(EVENT_IDS_FILTER, event.id)
+    tags = event_cache_tags(
+        event.id, event.organization_id, event.venue_id, {event.slug, previous_slug}
+    )
+    publish_change("event", action, event.id, event.id, data, tags)
+
+
+def publish_ticket_type_change(ticket_type, action: str):
+    data = None if action == "deleted" else TicketTypeSerializer(ticket_type).data
+    tags = event_cache_tags(ticket_type.event_id, slugs=[ticket_type.event.slug])
+    publish_change(
+        "ticket_type", action, ticket_type.id, ticket_type.event_id, data, tags
+    )
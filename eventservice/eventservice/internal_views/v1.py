@@ -2,24 +2,77 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
-from django.core.paginator import Paginator
-from eventservice.models import Event, Organization
+from django.db.models import Q
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from eventservice.models import Event, Organization, TicketType
 from eventservice.serializers import EventSerializer, OrganizationSerializer
 from eventservice.permissions import IsInternalRequest
-import logging
+from eventservice.changes import publish_event_change
+from utils.redis import redis_client, stable_digest
+from utils.view_cache import etag_matches
+import base64, json, logging
+from typing import Any, Optional
 
 logger = logging.getLogger(__name__)
 
 
+def event_etag(event_id: int, updated_at, ticket_versions) -> str:
+    """
+    ETag of an event response, from the event's updated_at and the
+    (id, updated_at) of its ticket types, so it can be computed without
+    loading or serializing the event
+    """
+    versions = sorted([ticket_id, version] for ticket_id, version in ticket_versions)
+    return f'"{stable_digest([event_id, updated_at, versions])}"'
+
+
 @api_view(["GET"])
 @permission_classes([IsInternalRequest])
 def get_event_by_id(request, event_id):
-    """Get single event by ID - Internal API"""
+    """
+    Get single event by ID - Internal API
+
+    Responds with an ETag and answers a matching If-None-Match with an
+    empty 304, after two small version queries.
+    """
     try:
-        event = get_object_or_404(Event, id=event_id)
-        serializer = EventSerializer(event)
-        return Response({"success": True, "data": serializer.data})
+        updated_at = (
+            Event.objects.filter(id=event_id)
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+        if updated_at is None:
+            # A real 404, so clients can cache the miss
+            return Response(
+                {"success": False, "error": "Event not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        ticket_versions = TicketType.objects.filter(event_id=event_id).values_list(
+            "id", "updated_at"
+        )
+        etag = event_etag(event_id, updated_at, ticket_versions)
+        if etag_matches(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            event = (
+                Event.objects.select_related("venue", "organization")
+                .prefetch_related("ticket_types")
+                .get(id=event_id)
+            )
+            serializer = EventSerializer(event)
+            response = Response({"success": True, "data": serializer.data})
+        response["ETag"] = etag
+        return response
+    except Event.DoesNotExist:
+        # Deleted between the version query and the load
+        return Response(
+            {"success": False, "error": "Event not found"},
+            status=status.HTTP_404_NOT_FOUND,
+        )
     except Exception as e:
         return Response(
             {"success": False, "error": str(e)},
@@ -27,35 +80,85 @@ def get_event_by_id(request, event_id):
         )
 
 
-@api_view(["GET"])
-@permission_classes([IsInternalRequest])
-def get_events_by_user(request, user_id):
-    """Get all events for a specific user - Internal API"""
+# Largest page served by keyset pagination
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(event: Event) -> str:
+    """Opaque cursor pointing just past event in (created_at, id) order"""
+    position = json.dumps([event.created_at.isoformat(), event.id])
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    """(created_at, id) of a cursor, raising ValueError if it is malformed"""
     try:
-        events = Event.objects.filter(user_id=user_id).order_by("-created_at")
+        created_at, event_id = json.loads(base64.urlsafe_b64decode(cursor))
+        created_at = parse_datetime(created_at)
+    except Exception:
+        raise ValueError(f"invalid cursor: {cursor}")
+    if created_at is None or not isinstance(event_id, int):
+        raise ValueError(f"invalid cursor: {cursor}")
+    return created_at, event_id
 
-        # Handle pagination
-        page = request.GET.get("page", 1)
-        limit = request.GET.get("limit", 20)
 
-        paginator = Paginator(events, limit)
-        events_page = paginator.get_page(page)
+def keyset_page(request, events):
+    """
+    One page of events, newest first, after ?cursor= (from the previous
+    page's next_cursor; omit or leave empty for the first page)
 
-        serializer = EventSerializer(events_page, many=True)
+    Seeks on (created_at, id) instead of counting and skipping rows, so
+    every page costs the same however deep it is.
+    """
+    try:
+        limit = min(max(int(request.GET.get("limit", 20)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        limit = 20
 
-        return Response(
-            {
-                "success": True,
-                "data": serializer.data,
-                "pagination": {
-                    "total": paginator.count,
-                    "pages": paginator.num_pages,
-                    "current_page": int(page),
-                    "has_next": events_page.has_next(),
-                    "has_previous": events_page.has_previous(),
-                },
-            }
+    cursor = request.GET.get("cursor")
+    if cursor:
+        try:
+            created_at, event_id = decode_cursor(cursor)
+        except ValueError as e:
+            return Response(
+                {"success": False, "error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        events = events.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=event_id)
         )
+
+    page = list(
+        events.select_related("venue", "organization")
+        .prefetch_related("ticket_types")
+        .order_by("-created_at", "-id")[: limit + 1]
+    )
+    has_next = len(page) > limit
+    page = page[:limit]
+
+    return Response(
+        {
+            "success": True,
+            "data": EventSerializer(page, many=True).data,
+            "pagination": {
+                "limit": limit,
+                "has_next": has_next,
+                "next_cursor": encode_cursor(page[-1]) if has_next else None,
+            },
+        }
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsInternalRequest])
+def get_events_by_organization(request, organization_id):
+    """
+    Events of an organization, by its remote id, with keyset pagination -
+    Internal API
+    """
+    try:
+        events = Event.objects.filter(organization__remote_id=organization_id)
+        return keyset_page(request, events)
     except Exception as e:
         return Response(
             {"success": False, "error": str(e)},
@@ -63,6 +166,25 @@ def get_events_by_user(request, user_id):
         )
 
 
+@api_view(["GET"])
+@permission_classes([IsInternalRequest])
+def get_events_by_user(request, user_id):
+    """
+    Get all events for a specific user - Internal API
+
+    Events belong to organizations, not users, so there is nothing to look
+    up yet: answer 501 instead of failing on a missing field. Use
+    organizations/<id>/events/ for an organization's events.
+    """
+    return Response(
+        {
+            "success": False,
+            "error": "Events are not linked to users; list them by organization",
+        },
+        status=status.HTTP_501_NOT_IMPLEMENTED,
+    )
+
+
 @api_view(["GET"])
 @permission_classes([IsInternalRequest])
 def get_events_by_status(request, event_status):
@@ -137,6 +259,7 @@ def update_event_status(request, event_id):
 
         event.status = new_status
         event.save(update_fields=["status", "updated_at"])
+        publish_event_change(event, "status_changed")
 
         return Response(
             {
@@ -149,3 +272,126 @@ def update_event_status(request, event_id):
             {"success": False, "error": str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
+
+
+# Most status updates accepted by one bulk request
+MAX_BULK_STATUS_UPDATES = 500
+
+
+def coerce_event_id(value: Any) -> Optional[int]:
+    """value as an event id (an int or a numeric string), None if invalid"""
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        return None
+    try:
+        event_id = int(value)
+    except ValueError:
+        return None
+    return event_id if event_id > 0 else None
+
+
+@api_view(["PUT"])
+@permission_classes([IsInternalRequest])
+def bulk_update_event_status(request):
+    """
+    Update the status of many events at once - Internal API
+
+    Body: {"updates": [{"event_id": 1, "status": "cancelled"}, ...]}
+
+    Valid updates are applied in one transaction with one UPDATE per target
+    status; invalid ones are reported without affecting the rest. Event ids
+    may be ints or numeric strings.
+    """
+    try:
+        updates = request.data.get("updates")
+        if not isinstance(updates, list) or not updates:
+            return Response(
+                {"success": False, "error": "updates is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(updates) > MAX_BULK_STATUS_UPDATES:
+            return Response(
+                {
+                    "success": False,
+                    "error": f"at most {MAX_BULK_STATUS_UPDATES} updates per request",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = {}
+        # Malformed entries, reported as given: (event_id, error)
+        rejected = []
+        by_status = {}
+        for update in updates:
+            raw_id = update.get("event_id") if isinstance(update, dict) else None
+            event_id = coerce_event_id(raw_id)
+            if event_id is None:
+                rejected.append((raw_id, f"invalid event_id: {raw_id}"))
+                continue
+            new_status = update.get("status")
+            if event_id in results:
+                results[event_id] = "duplicate event_id"
+            elif new_status not in Event.Status.values:
+                results[event_id] = f"invalid status: {new_status}"
+            else:
+                results[event_id] = None
+                by_status.setdefault(new_status, []).append(event_id)
+
+        changed = []
+        with transaction.atomic():
+            now = timezone.now()
+            for new_status, event_ids in by_status.items():
+                event_ids = [i for i in event_ids if results[i] is None]
+                found = Event.objects.select_for_update().filter(id__in=event_ids)
+                current = dict(found.values_list("id", "status"))
+                for event_id in event_ids:
+                    if event_id not in current:
+                        results[event_id] = "event not found"
+                to_change = [i for i, old in current.items() if old != new_status]
+                Event.objects.filter(id__in=to_change).update(
+                    status=new_status, updated_at=now
+                )
+                changed.extend(to_change)
+
+            events = (
+                Event.objects.filter(id__in=changed)
+                .select_related("venue", "organization")
+                .prefetch_related("ticket_types")
+            )
+            for event in events:
+                publish_event_change(event, "status_changed")
+
+        updated = [i for i, error in results.items() if error is None]
+        return Response(
+            {
+                "success": True,
+                "results": [
+                    {"event_id": event_id, "success": error is None}
+                    | ({"error": error} if error else {})
+                    for event_id, error in [*results.items(), *rejected]
+                ],
+                "updated_count": len(updated),
+                "changed_count": len(changed),
+                "failed_count": len(results) - len(updated) + len(rejected),
+            }
+        )
+    except Exception as e:
+        return Response(
+            {"success": False, "error": str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@api_view(["GET"])
+@permission_classes([IsInternalRequest])
+def get_redis_metrics(request):
+    """
+    Redis client metrics of the worker process serving the request - Internal API
+
+    ?output=prometheus returns the Prometheus text format instead of JSON.
+    """
+    if request.GET.get("output") == "prometheus":
+        return HttpResponse(
+            redis_client.metrics.render_prometheus(),
+            content_type="text/plain; version=0.0.4",
+        )
+    return Response({"success": True, "data": redis_client.export_metrics()})
@@ -0,0 +1,80 @@
+import json, time
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from eventservice.models import Event
+from eventservice.serializers import EventSerializer
+from utils.codec import (
+    Codec,
+    available_compressions,
+    available_formats,
+    decode_legacy,
+)
+
+
+class Command(BaseCommand):
+    help = "Compare encode/decode cost and size of the Redis value codecs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event-id",
+            type=int,
+            help="Event to serialize (defaults to the most recently updated one)",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=2000,
+            help="Number of encode/decode rounds per codec",
+        )
+
+    def handle(self, *args, **options):
+        events = Event.objects.select_related("venue", "organization")
+        if options["event_id"]:
+            event = events.filter(id=options["event_id"]).first()
+        else:
+            event = (
+                events.prefetch_related("ticket_types").order_by("-updated_at").first()
+            )
+        if event is None:
+            raise CommandError("No event found to benchmark with")
+
+        payload = EventSerializer(event).data
+        iterations = options["iterations"]
+        self.stdout.write(
+            f"Event {event.id} ({len(payload.get('ticket_types', []))} ticket types), "
+            f"{iterations} iterations"
+        )
+        self.stdout.write(
+            f"{'codec':<16}{'bytes':>10}{'encode us':>12}{'decode us':>12}"
+        )
+
+        codecs = {
+            "legacy": (
+                lambda value: json.dumps(value, cls=DjangoJSONEncoder),
+                decode_legacy,
+            )
+        }
+        for name in available_formats():
+            codec = Codec(name)
+            codecs[name] = (codec.encode, codec.decode)
+            # The same format with every compression, whatever the payload size
+            for compression in available_compressions():
+                codec = Codec(name, compression=compression, threshold=0)
+                codecs[f"{name}+{compression}"] = (codec.encode, codec.decode)
+
+        for name, (encode, decode) in codecs.items():
+            encoded = encode(payload)
+
+            started = time.perf_counter()
+            for _ in range(iterations):
+                encode(payload)
+            encode_us = (time.perf_counter() - started) / iterations * 1e6
+
+            started = time.perf_counter()
+            for _ in range(iterations):
+                decode(encoded)
+            decode_us = (time.perf_counter() - started) / iterations * 1e6
+
+            self.stdout.write(
+                f"{name:<16}{len(encoded):>10}{encode_us:>12.1f}{decode_us:>12.1f}"
+            )
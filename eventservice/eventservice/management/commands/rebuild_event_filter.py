@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from eventservice.models import Event
+from utils.redis import EVENT_IDS_FILTER, redis_client
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the Bloom filter of event ids from the database, e.g. after a "
+        "Redis failover or to drop deleted events; run it periodically"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Event ids read from the database per query",
+        )
+
+    def handle(self, *args, **options):
+        started = timezone.now()
+        ids = Event.objects.order_by().values_list("id", flat=True)
+        added = redis_client.bloom_rebuild(
+            EVENT_IDS_FILTER, ids.iterator(chunk_size=options["chunk_size"])
+        )
+        if added < 0:
+            raise CommandError("Could not rebuild the event id filter")
+
+        # Events created while the filter was being built were added to the
+        # old one, which the rebuild replaced; add them again
+        recent = Event.objects.filter(created_at__gte=started).values_list(
+            "id", flat=True
+        )
+        redis_client.bloom_add(EVENT_IDS_FILTER, *recent)
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt event id filter: {added} ids"))
@@ -0,0 +1,102 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from eventservice.models import Event
+from eventservice.serializers import EventSerializer
+from utils.redis import event_key, inventory_key, inventory_limits_key, redis_client
+
+
+class Command(BaseCommand):
+    help = (
+        "Load published upcoming events and their ticket inventory into Redis, "
+        "e.g. after a deploy or a Redis failover"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=200,
+            help="Events read from the database and written per pipeline",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=0,
+            help="Maximum events written per second (0 for no limit)",
+        )
+        parser.add_argument(
+            "--ttl",
+            type=int,
+            default=getattr(settings, "EVENT_CACHE_TTL", 300),
+            help="Expiry in seconds of the event snapshots (default: EVENT_CACHE_TTL)",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size, rate = options["chunk_size"], options["rate"]
+        if options["ttl"] <= 0:
+            # Without an expiry a snapshot that misses a change stays stale
+            raise CommandError("--ttl must be positive")
+        events = (
+            Event.objects.filter(
+                status=Event.Status.PUBLISHED, start_time__gte=timezone.now()
+            )
+            .select_related("venue", "organization")
+            .prefetch_related("ticket_types")
+            .order_by("start_time", "id")
+        )
+        total = events.count()
+        self.stdout.write(f"Warming {total} published upcoming events")
+
+        started = time.monotonic()
+        warmed = 0
+        chunk = []
+        for event in events.iterator(chunk_size=chunk_size):
+            chunk.append(event)
+            if len(chunk) == chunk_size:
+                warmed += self.warm(chunk, options["ttl"])
+                chunk = []
+                self.progress(warmed, total, started, rate)
+        if chunk:
+            warmed += self.warm(chunk, options["ttl"])
+            self.progress(warmed, total, started, rate)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Warmed {warmed} events in {time.monotonic() - started:.1f}s"
+            )
+        )
+
+    def warm(self, events, ttl):
+        """
+        Write one chunk in a single pipeline. Inventory counters that already
+        exist are left alone so live reservations are not overwritten.
+        """
+        payloads = EventSerializer(events, many=True).data
+        with redis_client.pipeline() as pipe:
+            for event, payload in zip(events, payloads):
+                pipe.set_event_snapshot(event_key(event.id), payload, ttl)
+                for ticket_type in event.ticket_types.all():
+                    pipe.hsetnx(
+                        inventory_key(event.id),
+                        str(ticket_type.id),
+                        ticket_type.available,
+                    )
+                    pipe.hsetnx(
+                        inventory_limits_key(event.id),
+                        str(ticket_type.id),
+                        ticket_type.per_person_limit,
+                    )
+        return len(events)
+
+    def progress(self, warmed, total, started, rate):
+        elapsed = time.monotonic() - started
+        if rate and warmed / rate > elapsed:
+            # Stay under the requested rate
+            time.sleep(warmed / rate - elapsed)
+            elapsed = warmed / rate
+        self.stdout.write(
+            f"  {warmed}/{total} events ({warmed * 100 // max(total, 1)}%), "
+            f"{warmed / elapsed if elapsed else 0:.0f} events/s"
+        )
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eventservice", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["organization", "created_at", "id"],
+                name="eventservic_organiz_225215_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eventservice", "0002_event_organization_created_at_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tickettype",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
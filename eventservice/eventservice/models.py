@@ -79,6 +79,10 @@ class Event(models.Model):
 
     class Meta:
         ordering = ["-start_time"]
+        indexes = [
+            # Keyset pagination of an organization's events, newest first
+            models.Index(fields=["organization", "created_at", "id"]),
+        ]
 
 
 class TicketType(models.Model):
@@ -98,6 +102,7 @@ class TicketType(models.Model):
     is_active = models.BooleanField(default=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     @property
     def available(self):
@@ -113,6 +113,9 @@ REST_FRAMEWORK = {
         "eventservice.authentication.StatelessJWTAuthentication",
     ),
     "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend",),
+    "DEFAULT_THROTTLE_RATES": {
+        "event_list": config("THROTTLE_RATE_EVENT_LIST", default="120/min"),
+    },
 }
 
 # SimpleJWT
@@ -158,6 +161,43 @@ REDIS_PORT = config("REDIS_PORT", default="")
 REDIS_PASSWORD = config("REDIS_PASSWORD", default="")
 REDIS_DB = config("REDIS_DB", default="")
 REDIS_USERNAME = config("REDIS_USERNAME", default="")
+# Treat REDIS_URL / REDIS_HOST as a startup node of a Redis Cluster (REDIS_DB is ignored)
+REDIS_CLUSTER = config("REDIS_CLUSTER", default=False, cast=bool)
+# Connection pool, one per worker process
+REDIS_MAX_CONNECTIONS = config("REDIS_MAX_CONNECTIONS", default=20, cast=int)
+REDIS_POOL_TIMEOUT = config("REDIS_POOL_TIMEOUT", default=5, cast=int)
+REDIS_HEALTH_CHECK_INTERVAL = config(
+    "REDIS_HEALTH_CHECK_INTERVAL", default=30, cast=int
+)
+# Value format for RedisClient writes: orjson, msgpack or json
+REDIS_CODEC = config("REDIS_CODEC", default="orjson")
+# Compress encoded values of at least THRESHOLD bytes: zstd, zlib, or empty for none
+REDIS_COMPRESSION = config("REDIS_COMPRESSION", default="zstd")
+REDIS_COMPRESSION_THRESHOLD = config(
+    "REDIS_COMPRESSION_THRESHOLD", default=1024, cast=int
+)
+REDIS_COMPRESSION_LEVEL = config("REDIS_COMPRESSION_LEVEL", default="")
+# In-process cache tier in front of cache_* keys (size 0 disables it)
+REDIS_LOCAL_CACHE_SIZE = config("REDIS_LOCAL_CACHE_SIZE", default=1024, cast=int)
+REDIS_LOCAL_CACHE_TTL = config("REDIS_LOCAL_CACHE_TTL", default=5, cast=float)
+# Socket timeouts in seconds; with fail-fast on, timed out commands are not retried
+REDIS_SOCKET_TIMEOUT = config("REDIS_SOCKET_TIMEOUT", default=5, cast=float)
+REDIS_SOCKET_CONNECT_TIMEOUT = config(
+    "REDIS_SOCKET_CONNECT_TIMEOUT", default=5, cast=float
+)
+REDIS_FAIL_FAST = config("REDIS_FAIL_FAST", default=False, cast=bool)
+# Consecutive failures that open the circuit breaker, and seconds before it probes
+REDIS_BREAKER_FAILURES = config("REDIS_BREAKER_FAILURES", default=5, cast=int)
+REDIS_BREAKER_RESET_TIMEOUT = config(
+    "REDIS_BREAKER_RESET_TIMEOUT", default=30, cast=float
+)
+# Approximate number of entries kept per Redis Stream
+REDIS_STREAM_MAXLEN = config("REDIS_STREAM_MAXLEN", default=10000, cast=int)
+# Bits and hash functions of Bloom filters; must match across services
+REDIS_BLOOM_SIZE = config("REDIS_BLOOM_SIZE", default=8388608, cast=int)
+REDIS_BLOOM_HASHES = config("REDIS_BLOOM_HASHES", default=7, cast=int)
+# Seconds event snapshots written by this service stay cached
+EVENT_CACHE_TTL = config("EVENT_CACHE_TTL", default=300, cast=int)
 
 
 # ---------------------------------------------------------
@@ -0,0 +1,271 @@
+import base64, os
+from datetime import timedelta
+from io import StringIO
+import fakeredis, redis
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from eventservice.changes import publish_event_change
+from eventservice.internal_views.v1 import decode_cursor, encode_cursor
+from eventservice.models import Event, Organization, TicketType, Venue
+from utils.redis import InstrumentedRedis, event_key, redis_client, ticket_types_key
+
+
+class FakeRedisMixin:
+    """Points the shared redis_client at a fresh fakeredis server per test"""
+
+    def setUp(self):
+        super().setUp()
+        self._saved_client = (redis_client._client, redis_client._pid)
+        connection = InstrumentedRedis(
+            connection_pool=redis.ConnectionPool(
+                connection_class=fakeredis.FakeConnection,
+                server=fakeredis.FakeServer(),
+            )
+        )
+        connection.metrics = redis_client.metrics
+        connection.breaker = redis_client.breaker
+        redis_client._client, redis_client._pid = connection, os.getpid()
+
+    def tearDown(self):
+        redis_client._client, redis_client._pid = self._saved_client
+        super().tearDown()
+
+
+def create_event(venue: Venue, title: str, **fields) -> Event:
+    """Event at venue starting tomorrow, with fields overriding the defaults"""
+    start_time = timezone.now() + timedelta(days=1)
+    defaults = {
+        "start_time": start_time,
+        "end_time": start_time + timedelta(hours=2),
+        "status": Event.Status.DRAFT,
+    }
+    return Event.objects.create(venue=venue, title=title, **{**defaults, **fields})
+
+
+@override_settings(INTERNAL_SERVICE_IPS=["127.0.0.1"])
+class BulkEventStatusTest(TestCase):
+    """Test cases for the internal bulk event status endpoint"""
+
+    def setUp(self):
+        self.venue = Venue.objects.create(
+            name="Hall", address_1="1 Main St", city="Nairobi", country="KE"
+        )
+        self.first = create_event(self.venue, "First")
+        self.second = create_event(self.venue, "Second")
+
+    def put_updates(self, updates):
+        return self.client.put(
+            reverse("bulk_update_event_status"),
+            {"updates": updates},
+            content_type="application/json",
+        )
+
+    def test_each_update_is_reported_on_its_own(self):
+        """Test that bad ids fail per item instead of rejecting the batch"""
+        response = self.put_updates(
+            [
+                {"event_id": str(self.first.id), "status": "published"},
+                {"event_id": 999999, "status": "published"},
+                {"event_id": self.second.id, "status": "published"},
+                {"event_id": self.second.id, "status": "cancelled"},
+                {"event_id": "abc", "status": "published"},
+                {"status": "published"},
+            ]
+        )
+        self.assertEqual(response.status_code, 200)
+        results = {
+            str(result["event_id"]): result for result in response.json()["results"]
+        }
+        self.assertTrue(results[str(self.first.id)]["success"])
+        self.assertEqual(results["999999"]["error"], "event not found")
+        self.assertEqual(results[str(self.second.id)]["error"], "duplicate event_id")
+        self.assertIn("invalid event_id", results["abc"]["error"])
+        self.assertIn("invalid event_id", results["None"]["error"])
+        self.assertEqual(response.json()["updated_count"], 1)
+        self.assertEqual(response.json()["failed_count"], 4)
+
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.status, Event.Status.PUBLISHED)
+        self.assertEqual(self.second.status, Event.Status.DRAFT)
+
+
+class WarmCacheTest(FakeRedisMixin, TestCase):
+    """Test cases for the warm_cache command"""
+
+    def test_snapshots_are_written_where_clients_read_them(self):
+        """Test that warmed snapshots use the shared key and always expire"""
+        venue = Venue.objects.create(
+            name="Hall", address_1="1 Main St", city="Nairobi", country="KE"
+        )
+        event = create_event(venue, "Warm", status=Event.Status.PUBLISHED)
+        ticket_type = TicketType.objects.create(
+            event=event, name="GA", price=10, quantity_total=5
+        )
+
+        call_command("warm_cache", stdout=StringIO())
+
+        key = event_key(event.id)
+        self.assertEqual(redis_client.get_event_snapshot(key)["title"], "Warm")
+        self.assertGreater(redis_client.redis_client.ttl(key), 0)
+        self.assertGreater(redis_client.redis_client.ttl(ticket_types_key(key)), 0)
+        self.assertEqual(redis_client.get_inventory(event.id), {str(ticket_type.id): 5})
+
+
+@override_settings(INTERNAL_SERVICE_IPS=["127.0.0.1"])
+class KeysetPaginationTest(TestCase):
+    """Test cases for cursor pagination of internal event listings"""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(remote_id=77)
+        venue = Venue.objects.create(
+            name="Hall", address_1="1 Main St", city="Nairobi", country="KE"
+        )
+        self.events = [
+            create_event(venue, f"Event {i}", organization=self.organization)
+            for i in range(7)
+        ]
+        # Ties on created_at must be broken by id, not skipped or repeated
+        tied = [event.id for event in self.events[2:5]]
+        Event.objects.filter(id__in=tied).update(created_at=self.events[2].created_at)
+
+    def get_page(self, cursor, limit=3):
+        return self.client.get(
+            reverse("get_events_by_organization", args=[77]),
+            {"cursor": cursor, "limit": limit},
+        )
+
+    def test_pages_cover_every_event_once_newest_first(self):
+        """Test ordering and completeness across page boundaries"""
+        seen, cursor = [], ""
+        while True:
+            response = self.get_page(cursor)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertLessEqual(len(body["data"]), 3)
+            seen.extend(event["id"] for event in body["data"])
+            if not body["pagination"]["has_next"]:
+                break
+            cursor = body["pagination"]["next_cursor"]
+
+        expected = list(
+            Event.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_cursor_round_trip(self):
+        """Test that a cursor points at the (created_at, id) of its event"""
+        event = Event.objects.get(id=self.events[3].id)
+        self.assertEqual(
+            decode_cursor(encode_cursor(event)), (event.created_at, event.id)
+        )
+
+    def test_invalid_cursors_are_rejected(self):
+        """Test that malformed cursors fail with a 400 instead of a 500"""
+        for cursor in (
+            "not a cursor",
+            base64.urlsafe_b64encode(b'["yesterday", 1]').decode(),
+            base64.urlsafe_b64encode(b'["2026-01-01T00:00:00+00:00", "1"]').decode(),
+        ):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+            self.assertEqual(self.get_page(cursor).status_code, 400)
+
+    def test_user_events_are_not_served(self):
+        """Test that the user listing says it is unsupported instead of erroring"""
+        response = self.client.get(
+            reverse("get_events_by_user", args=[5]), {"cursor": ""}
+        )
+        self.assertEqual(response.status_code, 501)
+
+
+class CachedEventResponseTest(FakeRedisMixin, TestCase):
+    """Test cases for ETags of cached public event responses"""
+
+    def setUp(self):
+        super().setUp()
+        venue = Venue.objects.create(
+            name="Hall", address_1="1 Main St", city="Nairobi", country="KE"
+        )
+        self.event = create_event(venue, "Launch", slug="launch")
+
+    def get(self, slug, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.client.get(reverse("events-detail", args=[slug]), **headers)
+
+    def update(self, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            previous_slug = self.event.slug
+            for field, value in fields.items():
+                setattr(self.event, field, value)
+            self.event.save()
+            publish_event_change(self.event, "updated", previous_slug)
+
+    def test_unchanged_event_is_not_modified(self):
+        """Test that a repeated request with the ETag gets an empty 304"""
+        first = self.get("launch")
+        self.assertEqual(first.status_code, 200)
+        second = self.get("launch", first["ETag"])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_update_changes_the_etag(self):
+        """Test that an updated event is served again with a new ETag"""
+        old_etag = self.get("launch")["ETag"]
+        self.update(title="Launch party")
+
+        response = self.get("launch", old_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["title"], "Launch party")
+        self.assertNotEqual(response["ETag"], old_etag)
+
+    def test_renamed_slug_drops_the_old_response(self):
+        """Test that the old slug stops serving the cached event once renamed"""
+        self.assertEqual(self.get("launch").status_code, 200)
+        self.update(slug="launch-party")
+        self.assertEqual(self.get("launch").status_code, 404)
+        self.assertEqual(self.get("launch-party").status_code, 200)
+
+
+@override_settings(INTERNAL_SERVICE_IPS=["127.0.0.1"])
+class InternalEventETagTest(TestCase):
+    """Test cases for ETags of the internal event endpoint"""
+
+    def setUp(self):
+        venue = Venue.objects.create(
+            name="Hall", address_1="1 Main St", city="Nairobi", country="KE"
+        )
+        self.event = create_event(venue, "Launch")
+        self.ticket_type = TicketType.objects.create(
+            event=self.event, name="GA", price=10, quantity_total=5
+        )
+
+    def get(self, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.client.get(
+            reverse("get_event_by_id", args=[self.event.id]), **headers
+        )
+
+    def test_unchanged_event_is_not_modified(self):
+        """Test that a matching If-None-Match gets an empty 304 with the ETag"""
+        first = self.get()
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()["data"]["title"], "Launch")
+        second = self.get(first["ETag"])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_ticket_type_update_changes_the_etag(self):
+        """Test that changing a ticket type alone gives the event a new ETag"""
+        old_etag = self.get()["ETag"]
+        TicketType.objects.filter(id=self.ticket_type.id).update(
+            updated_at=timezone.now() + timedelta(seconds=1)
+        )
+        response = self.get(old_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], old_etag)
+        self.assertEqual(self.get(response["ETag"]).status_code, 304)
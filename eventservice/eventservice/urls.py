@@ -5,9 +5,12 @@ from rest_framework import routers
 from eventservice.internal_views.v1 import (
     get_event_by_id,
     get_events_by_user,
+    get_events_by_organization,
     bulk_get_events,
     get_events_by_status,
     update_event_status,
+    bulk_update_event_status,
+    get_redis_metrics,
 )
 
 router = routers.DefaultRouter()
@@ -16,11 +19,22 @@ router.register(r"events", EventsViewSet, basename="events")
 v1_internal_views = [
     path("events/<int:event_id>/", get_event_by_id, name="get_event_by_id"),
     path("users/<int:user_id>/events/", get_events_by_user, name="get_events_by_user"),
+    path(
+        "organizations/<int:organization_id>/events/",
+        get_events_by_organization,
+        name="get_events_by_organization",
+    ),
     path("events/bulk/", bulk_get_events, name="bulk_get_events"),
     path("events/status/", get_events_by_status, name="get_events_by_status"),
+    path(
+        "events/status/bulk/",
+        bulk_update_event_status,
+        name="bulk_update_event_status",
+    ),
     path(
         "events/<int:event_id>/status/", update_event_status, name="update_event_status"
     ),
+    path("metrics/redis/", get_redis_metrics, name="get_redis_metrics"),
 ]
 
 urlpatterns = [
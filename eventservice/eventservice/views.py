@@ -2,13 +2,22 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.viewsets import ModelViewSet
 from rest_framework import status
+from django.conf import settings
 from .models import Event, Organization
 from .serializers import EventSerializer, VenueSerializer, TicketTypeSerializer
 from .permissions import IsOrganizer
 from rest_framework import filters
 from django_filters.rest_framework import DjangoFilterBackend
 from .filters import EventFilter
-from utils.redis import redis_client
+from utils.redis import event_key, redis_client
+from .changes import (
+    EVENT_LIST_TAG,
+    event_slug_tag,
+    publish_event_change,
+    publish_ticket_type_change,
+)
+from utils.throttling import EventListThrottle
+from utils.view_cache import cache_response
 
 
 class EventsViewSet(ModelViewSet):
@@ -33,6 +42,19 @@ class EventsViewSet(ModelViewSet):
             return [AllowAny()]
         return [IsAuthenticated(), IsOrganizer()]
 
+    def get_throttles(self):
+        if self.request.method == "GET":
+            return [EventListThrottle()]
+        return super().get_throttles()
+
+    @cache_response(timeout=300, tags=[EVENT_LIST_TAG])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response(timeout=300, tags=lambda kwargs: [event_slug_tag(kwargs["slug"])])
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def create(self, request):
         """
         Create a new event.
@@ -83,18 +105,42 @@ class EventsViewSet(ModelViewSet):
             )
             ticket_type_serializer.is_valid(raise_exception=True)
             ticket_type_serializer.save(event=event_serializer.instance)
-            # Cache the event data
-            redis_client.set(
-                f"ticket_type:{ticket_type_serializer.instance.id}",
-                ticket_type_serializer.instance.quantity,
-            )
+            publish_ticket_type_change(ticket_type_serializer.instance, "created")
+
+        # Cache the remaining stock and per-person limit of every ticket type
+        ticket_types = event_serializer.instance.ticket_types.all()
+        redis_client.set_inventory(
+            event_serializer.instance.id,
+            {ticket_type.id: ticket_type.available for ticket_type in ticket_types},
+            limits={
+                ticket_type.id: ticket_type.per_person_limit
+                for ticket_type in ticket_types
+            },
+        )
 
         # Cache the event data
-        redis_client.set(
-            f"event:{event_serializer.instance.id}",
+        redis_client.set_event_snapshot(
+            event_key(event_serializer.instance.id),
             event_serializer.data,
+            getattr(settings, "EVENT_CACHE_TTL", 300),
         )
+        publish_event_change(event_serializer.instance, "created")
         return Response(
             event_serializer.data,
             status=status.HTTP_201_CREATED,
         )
+
+    def perform_update(self, serializer):
+        previous_status = serializer.instance.status
+        previous_slug = serializer.instance.slug
+        super().perform_update(serializer)
+        status_changed = serializer.instance.status != previous_status
+        publish_event_change(
+            serializer.instance,
+            "status_changed" if status_changed else "updated",
+            previous_slug,
+        )
+
+    def perform_destroy(self, instance):
+        publish_event_change(instance, "deleted")
+        super().perform_destroy(instance)
@@ -1,4 +1,3 @@
-from django.http import HttpResponseForbidden
 from django.conf import settings
 import ipaddress
 
@@ -0,0 +1,245 @@
+"""
+Value codecs for RedisClient.
+
+Every encoded value starts with a one-byte header naming its format. The
+header bytes are taken from the 0xF8-0xFF range, which never starts a valid
+UTF-8 string, so values written before the header existed are still told
+apart and decoded with the legacy "JSON, or the raw string" rules.
+
+Integers and floats are stored as plain ASCII so INCR/DECR/HINCRBY keep
+working on them. Decimals are serialized like other values.
+
+Encoded values of at least a threshold size can be compressed. A compressed
+value is a compression header byte followed by the compressed encoded value,
+header included, so reads stay transparent.
+"""
+
+import json, logging, threading, time, zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Format header bytes
+STR = 0xF8
+BYTES = 0xF9
+JSON = 0xFA
+ORJSON = 0xFB
+MSGPACK = 0xFC
+ZLIB = 0xFD
+ZSTD = 0xFE
+
+_django_default = DjangoJSONEncoder().default
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+
+
+def _json_loads(data: bytes) -> Any:
+    return json.loads(data)
+
+
+def _orjson_dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=_django_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _orjson_loads(data: bytes) -> Any:
+    return orjson.loads(data)
+
+
+def _msgpack_dumps(value: Any) -> bytes:
+    return msgpack.packb(value, default=_django_default, use_bin_type=True)
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def available_formats() -> Dict[str, Tuple[int, Callable, Callable]]:
+    """Structured formats usable in this environment, keyed by setting name"""
+    formats = {"json": (JSON, _json_dumps, _json_loads)}
+    if orjson is not None:
+        formats["orjson"] = (ORJSON, _orjson_dumps, _orjson_loads)
+    if msgpack is not None:
+        formats["msgpack"] = (MSGPACK, _msgpack_dumps, _msgpack_loads)
+    return formats
+
+
+def available_compressions() -> Dict[str, Tuple[int, Callable, Callable]]:
+    """Compression algorithms usable in this environment, keyed by setting name"""
+    compressions = {
+        "zlib": (
+            ZLIB,
+            lambda data, level: zlib.compress(data, 6 if level is None else level),
+            zlib.decompress,
+        )
+    }
+    if zstandard is not None:
+        compressions["zstd"] = (
+            ZSTD,
+            lambda data, level: zstandard.compress(data, 3 if level is None else level),
+            zstandard.decompress,
+        )
+    return compressions
+
+
+def decode_legacy(data: Any) -> Any:
+    """Decode a value written without a header: JSON if it parses, else text"""
+    if isinstance(data, bytes):
+        try:
+            data = data.decode("utf-8")
+        except UnicodeDecodeError:
+            return data
+    try:
+        return json.loads(data)
+    except (json.JSONDecodeError, TypeError):
+        return data
+
+
+class Codec:
+    """
+    Encode values to bytes for Redis and decode them back
+
+    Args:
+        format: Structured format for dicts, lists and other objects
+            ("orjson", "msgpack" or "json"). Falls back to "json" when the
+            library for the requested format is not installed.
+        compression: "zstd", "zlib" or None. Falls back to "zlib" when
+            zstandard is not installed.
+        threshold: Encoded size in bytes from which values are compressed
+        level: Compression level (the algorithm default when not given)
+    """
+
+    def __init__(
+        self,
+        format: str = "orjson",
+        compression: Optional[str] = None,
+        threshold: int = 1024,
+        level: Optional[int] = None,
+    ):
+        formats = available_formats()
+        if format not in formats:
+            logger.warning(f"Redis codec '{format}' is not available, using json")
+            format = "json"
+
+        self.format = format
+        self._header, self._dumps, _ = formats[format]
+        # Decode any known format, whichever one this codec writes
+        self._loads = {header: loads for header, _, loads in formats.values()}
+
+        compressions = available_compressions()
+        if compression and compression not in compressions:
+            logger.warning(
+                f"Redis compression '{compression}' is not available, using zlib"
+            )
+            compression = "zlib"
+        self.compression = compression or None
+        self.threshold = threshold
+        self.level = level
+        self._compress = compressions[compression] if compression else None
+        self._decompress = {header: dec for header, _, dec in compressions.values()}
+
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.compressed = 0
+            self.skipped = 0
+            self.bytes_in = 0
+            self.bytes_out = 0
+            self.compress_time = 0.0
+            self.decompressed = 0
+            self.decompress_time = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Compression ratio and CPU time spent compressing and decompressing"""
+        return {
+            "compression": self.compression,
+            "threshold": self.threshold,
+            "compressed": self.compressed,
+            "skipped": self.skipped,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": self.bytes_in / self.bytes_out if self.bytes_out else 0.0,
+            "compress_seconds": round(self.compress_time, 6),
+            "decompressed": self.decompressed,
+            "decompress_seconds": round(self.decompress_time, 6),
+        }
+
+    def encode(self, value: Any) -> bytes:
+        """Encode a value with its format header, compressing large values"""
+        if isinstance(value, bytes):
+            data = bytes((BYTES,)) + value
+        elif isinstance(value, str):
+            data = bytes((STR,)) + value.encode("utf-8")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            # Never compressed, so INCR keeps working. Decimals take the
+            # serializer path: read back as floats they would lose precision
+            return str(value).encode()
+        else:
+            data = bytes((self._header,)) + self._dumps(value)
+
+        if self._compress is None or len(data) < self.threshold:
+            return data
+        return self._compressed(data)
+
+    def _compressed(self, data: bytes) -> bytes:
+        header, compress, _ = self._compress
+        started = time.perf_counter()
+        compressed = compress(data, self.level)
+        elapsed = time.perf_counter() - started
+
+        with self._stats_lock:
+            self.compress_time += elapsed
+            if len(compressed) + 1 >= len(data):
+                self.skipped += 1
+                return data
+            self.compressed += 1
+            self.bytes_in += len(data)
+            self.bytes_out += len(compressed) + 1
+        return bytes((header,)) + compressed
+
+    def decode(self, data: Any) -> Any:
+        """Decode a stored value, falling back to the legacy rules"""
+        if data is None:
+            return None
+        if not isinstance(data, bytes) or not data:
+            return decode_legacy(data)
+
+        header = data[0]
+        decompress = self._decompress.get(header)
+        if decompress is not None:
+            started = time.perf_counter()
+            data = decompress(data[1:])
+            with self._stats_lock:
+                self.decompressed += 1
+                self.decompress_time += time.perf_counter() - started
+            header = data[0]
+
+        if header == STR:
+            return data[1:].decode("utf-8")
+        if header == BYTES:
+            return data[1:]
+        loads = self._loads.get(header)
+        if loads is not None:
+            return loads(data[1:])
+        if header >= 0xF8:
+            raise ValueError(f"Unsupported Redis value format 0x{header:02x}")
+        return decode_legacy(data)
@@ -0,0 +1,72 @@
+import threading, time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class LocalCache:
+    """
+    Bounded, thread-safe in-process LRU cache with a TTL per entry
+
+    Args:
+        max_size: Maximum number of entries; the least recently used entry is
+            evicted when it is exceeded
+        ttl: Default time to live in seconds
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 5):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value) for key"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store value for ttl seconds (the cache default when not given)"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        """Remove key, returning whether it was present"""
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
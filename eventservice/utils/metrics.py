@@ -0,0 +1,210 @@
+import bisect, threading
+from typing import Any, Dict, List, Tuple
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+def key_namespace(key: Any) -> str:
+    """
+    Namespace of a Redis key for hit/miss accounting: its first segment, or
+    the first two for cache_* keys ("cache:event:5" -> "cache:event")
+    """
+    if isinstance(key, bytes):
+        key = key.decode("utf-8", "replace")
+    parts = str(key).split(":", 2)
+    if parts[0] == "cache" and len(parts) > 2:
+        return f"{parts[0]}:{parts[1]}"
+    return parts[0]
+
+
+def payload_size(value: Any) -> int:
+    """Approximate wire size in bytes of command arguments or a reply"""
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (list, tuple, set)):
+        return sum(payload_size(item) for item in value)
+    if isinstance(value, dict):
+        return sum(payload_size(k) + payload_size(v) for k, v in value.items())
+    return len(str(value))
+
+
+# What can happen to a distributed lock, see record_lock
+LOCK_OUTCOMES = (
+    "acquired",
+    "contended",
+    "timeouts",
+    "errors",
+    "released",
+    "lost",
+    "extended",
+)
+
+
+class _CommandStats:
+    __slots__ = ("count", "errors", "total", "buckets", "bytes_out", "bytes_in")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.bytes_out = 0
+        self.bytes_in = 0
+
+
+class RedisMetrics:
+    """
+    Thread-safe counters for Redis traffic of one process
+
+    Records, per command, a latency histogram, error count and bytes sent
+    and received, plus hit/miss counts of key lookups per key namespace.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Zero every counter"""
+        with self._lock:
+            self._commands: Dict[str, _CommandStats] = {}
+            self._lookups: Dict[str, List[int]] = {}
+            self._locks: Dict[str, float] = dict.fromkeys(LOCK_OUTCOMES, 0)
+            self._locks["wait_seconds"] = 0.0
+
+    def observe(
+        self,
+        command: Any,
+        seconds: float,
+        error: bool = False,
+        bytes_out: int = 0,
+        bytes_in: int = 0,
+    ):
+        """Record one command round trip"""
+        if isinstance(command, bytes):
+            command = command.decode("utf-8", "replace")
+        command = str(command).upper()
+        index = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            stats = self._commands.get(command)
+            if stats is None:
+                stats = self._commands[command] = _CommandStats()
+            stats.count += 1
+            stats.total += seconds
+            stats.buckets[index] += 1
+            stats.bytes_out += bytes_out
+            stats.bytes_in += bytes_in
+            if error:
+                stats.errors += 1
+
+    def record_lookup(self, key: Any, hit: bool):
+        """Count a read of key as a hit or a miss of its namespace"""
+        namespace = key_namespace(key)
+        with self._lock:
+            counts = self._lookups.get(namespace)
+            if counts is None:
+                counts = self._lookups[namespace] = [0, 0]
+            counts[0 if hit else 1] += 1
+
+    def record_lock(self, outcome: str, wait: float = 0.0):
+        """
+        Count a lock outcome: acquired, contended (had to wait), timeouts,
+        errors, released, lost (expired before release/extend) or extended
+        """
+        with self._lock:
+            self._locks[outcome] += 1
+            self._locks["wait_seconds"] += wait
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of the counters as plain data"""
+        with self._lock:
+            commands = {}
+            for command, stats in self._commands.items():
+                cumulative, buckets = 0, {}
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), stats.buckets):
+                    cumulative += count
+                    buckets[str(bound)] = cumulative
+                commands[command] = {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "total_seconds": stats.total,
+                    "avg_seconds": stats.total / stats.count if stats.count else 0.0,
+                    "buckets": buckets,
+                    "bytes_out": stats.bytes_out,
+                    "bytes_in": stats.bytes_in,
+                }
+            lookups = {
+                namespace: {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+                }
+                for namespace, (hits, misses) in self._lookups.items()
+            }
+            locks = dict(self._locks)
+        return {"commands": commands, "lookups": lookups, "locks": locks}
+
+    def render_prometheus(self, prefix: str = "redis_client") -> str:
+        """The counters in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines: List[str] = []
+
+        def family(name: str, kind: str, samples: List[Tuple[str, str, Any]]):
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for suffix, labels, value in samples:
+                labels = f"{{{labels}}}" if labels else ""
+                lines.append(f"{prefix}_{name}{suffix}{labels} {value}")
+
+        durations, errors, sent, received = [], [], [], []
+        for command, stats in sorted(snapshot["commands"].items()):
+            label = f'command="{command}"'
+            for bound, count in stats["buckets"].items():
+                durations.append(("_bucket", f'{label},le="{bound}"', count))
+            durations.append(("_sum", label, stats["total_seconds"]))
+            durations.append(("_count", label, stats["count"]))
+            errors.append(("", label, stats["errors"]))
+            sent.append(("", label, stats["bytes_out"]))
+            received.append(("", label, stats["bytes_in"]))
+
+        family("command_duration_seconds", "histogram", durations)
+        family("command_errors_total", "counter", errors)
+        family("bytes_sent_total", "counter", sent)
+        family("bytes_received_total", "counter", received)
+
+        lookups = []
+        for namespace, counts in sorted(snapshot["lookups"].items()):
+            lookups.append(
+                ("", f'namespace="{namespace}",result="hit"', counts["hits"])
+            )
+            lookups.append(
+                ("", f'namespace="{namespace}",result="miss"', counts["misses"])
+            )
+        family("lookups_total", "counter", lookups)
+
+        locks = snapshot["locks"]
+        family(
+            "lock_events_total",
+            "counter",
+            [("", f'outcome="{outcome}"', locks[outcome]) for outcome in LOCK_OUTCOMES],
+        )
+        family("lock_wait_seconds_total", "counter", [("", "", locks["wait_seconds"])])
+
+        return "\n".join(lines) + "\n"
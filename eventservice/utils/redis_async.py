@@ -0,0 +1,699 @@
+import asyncio, json, logging, os, time, uuid, weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+import redis.asyncio as aioredis
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from utils import redis_scripts
+from utils.codec import Codec
+from utils.redis import (
+    CACHE_INVALIDATION_CHANNEL,
+    RedisClient,
+    RedisPipeline,
+    _setting,
+    _text,
+    build_cluster,
+    build_codec,
+    build_pool,
+    cluster_enabled,
+    cache_key,
+    inventory_holds_key,
+    inventory_key,
+    inventory_limits_key,
+    rate_limit_key,
+    redis_client,
+    session_key,
+    unwrap_cached,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRedisPipeline(RedisPipeline):
+    """RedisPipeline counterpart whose execute() is awaited"""
+
+    async def execute(self) -> List[Any]:
+        """Send all queued commands in one round trip and decode the replies"""
+        if not self._decoders:
+            self.results = []
+            return self.results
+
+        try:
+            raw_results = await self._pipeline.execute(raise_on_error=False)
+        except Exception as e:
+            logger.error(f"Redis PIPELINE error: {e}")
+            raw_results = [e] * len(self._decoders)
+
+        return self._collect(raw_results)
+
+
+class AsyncRedisClient:
+    """
+    asyncio counterpart of RedisClient for ASGI code paths
+
+    Method names, key conventions, codec and default return values match
+    RedisClient, so async views can use it as a drop-in replacement and fan
+    out many reads concurrently with asyncio.gather.
+
+    There is no in-process cache tier here, but cache writes evict the one
+    of sync_client and announce the change on the invalidation channel, so
+    no worker keeps serving a copy an async write replaced.
+    """
+
+    def __init__(self, sync_client: Optional[RedisClient] = None):
+        """
+        Prepare the client without connecting. asyncio connections are bound
+        to the event loop that opened them, so one pool is created lazily per
+        running loop in each process.
+        """
+        self.sync_client = sync_client or redis_client
+        self._origin = uuid.uuid4().hex
+        self._clients: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]"
+        ) = weakref.WeakKeyDictionary()
+        self._pid: Optional[int] = None
+        self._codec: Optional[Codec] = None
+        self._scripts: Dict[str, Any] = {}
+
+    @property
+    def redis_client(self) -> aioredis.Redis:
+        """Redis connection for the running event loop, created on first use"""
+        pid = os.getpid()
+        if self._pid != pid:
+            self._clients = weakref.WeakKeyDictionary()
+            self._pid = pid
+
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            if cluster_enabled():
+                client = build_cluster(aioredis.RedisCluster)
+            else:
+                client = aioredis.Redis(
+                    connection_pool=build_pool(aioredis.BlockingConnectionPool)
+                )
+            self._clients[loop] = client
+        return client
+
+    @property
+    def codec(self) -> Codec:
+        """Value codec, configured by the REDIS_CODEC and compression settings"""
+        if self._codec is None:
+            self._codec = build_codec()
+        return self._codec
+
+    def _encode(self, value: Any) -> bytes:
+        return self.codec.encode(value)
+
+    def _decode(self, value: Any) -> Any:
+        return self.codec.decode(value)
+
+    async def _run_script(self, source: str, keys: List[str], args: List[Any]) -> Any:
+        """Run a Lua script via EVALSHA, loading it on first use"""
+        script = self._scripts.get(source)
+        if script is None:
+            script = self._scripts[source] = self.redis_client.register_script(source)
+        return await script(keys=keys, args=args, client=self.redis_client)
+
+    async def close(self):
+        """Close the pool of the running event loop"""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    async def is_connected(self) -> bool:
+        """Check if Redis is connected"""
+        try:
+            await self.redis_client.ping()
+            return True
+        except aioredis.ConnectionError:
+            logger.error("Redis connection failed")
+            return False
+
+    async def decr(self, key: str, amount: int = 1) -> Optional[int]:
+        """Decrement the integer value of a key by the given amount"""
+        try:
+            return await self.redis_client.decr(key, amount)
+        except Exception as e:
+            logger.error(f"Redis DECR error for key {key}: {e}")
+            return None
+
+    async def incr(self, key: str, amount: int = 1) -> Optional[int]:
+        """Increment the integer value of a key by the given amount"""
+        try:
+            return await self.redis_client.incr(key, amount)
+        except Exception as e:
+            logger.error(f"Redis INCR error for key {key}: {e}")
+            return None
+
+    # Batch Operations
+    @asynccontextmanager
+    async def pipeline(
+        self, transaction: bool = False
+    ) -> AsyncIterator[AsyncRedisPipeline]:
+        """
+        Queue several commands and send them in a single round trip.
+        Anything still queued is executed when the block exits cleanly.
+        """
+        pipe = AsyncRedisPipeline(
+            self.redis_client.pipeline(transaction=transaction), self.codec
+        )
+        yield pipe
+        if len(pipe):
+            await pipe.execute()
+
+    async def mget(self, keys: List[str], default: Any = None) -> List[Any]:
+        """Get several keys in one round trip, in the order given"""
+        if not keys:
+            return []
+        try:
+            if cluster_enabled():
+                values = await self.redis_client.mget_nonatomic(keys)
+            else:
+                values = await self.redis_client.mget(keys)
+            return [default if v is None else self._decode(v) for v in values]
+        except Exception as e:
+            logger.error(f"Redis MGET error for keys {keys}: {e}")
+            return [default] * len(keys)
+
+    async def mset(
+        self, mapping: Dict[str, Any], ttl: Union[int, Dict[str, int], None] = None
+    ) -> bool:
+        """Set several key-value pairs in one round trip (see RedisClient.mset)"""
+        if not mapping:
+            return True
+        try:
+            if not ttl:
+                encoded = {k: self._encode(v) for k, v in mapping.items()}
+                if cluster_enabled():
+                    return all(await self.redis_client.mset_nonatomic(encoded))
+                return await self.redis_client.mset(encoded)
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in mapping.items():
+                key_ttl = ttl.get(key) if isinstance(ttl, dict) else ttl
+                pipe.set(key, self._encode(value), ex=key_ttl or None)
+            return all(await pipe.execute())
+        except Exception as e:
+            logger.error(f"Redis MSET error for keys {list(mapping)}: {e}")
+            return False
+
+    async def incr_many(self, amounts: Dict[str, int]) -> Dict[str, Optional[int]]:
+        """Increment several counters in one round trip, returning the new values"""
+        if not amounts:
+            return {}
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, amount in amounts.items():
+                pipe.incrby(key, amount)
+            return dict(zip(amounts, await pipe.execute()))
+        except Exception as e:
+            logger.error(f"Redis INCR error for keys {list(amounts)}: {e}")
+            return {key: None for key in amounts}
+
+    async def decr_many(self, amounts: Dict[str, int]) -> Dict[str, Optional[int]]:
+        """Decrement several counters in one round trip, returning the new values"""
+        return await self.incr_many({key: -amount for key, amount in amounts.items()})
+
+    # Basic Key-Value Operations
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Set a key-value pair with optional TTL"""
+        try:
+            value = self._encode(value)
+            if ttl:
+                return await self.redis_client.setex(key, ttl, value)
+            return await self.redis_client.set(key, value)
+        except Exception as e:
+            logger.error(f"Redis SET error for key {key}: {e}")
+            return False
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Get value by key with optional default"""
+        try:
+            value = await self.redis_client.get(key)
+            if value is None:
+                return default
+            return self._decode(value)
+        except Exception as e:
+            logger.error(f"Redis GET error for key {key}: {e}")
+            return default
+
+    async def delete(self, *keys: str) -> int:
+        """Delete one or more keys"""
+        try:
+            return await self.redis_client.delete(*keys)
+        except Exception as e:
+            logger.error(f"Redis DELETE error for keys {keys}: {e}")
+            return 0
+
+    async def exists(self, key: str) -> bool:
+        """Check if key exists"""
+        try:
+            return bool(await self.redis_client.exists(key))
+        except Exception as e:
+            logger.error(f"Redis EXISTS error for key {key}: {e}")
+            return False
+
+    async def expire(self, key: str, ttl: int) -> bool:
+        """Set TTL for existing key"""
+        try:
+            return await self.redis_client.expire(key, ttl)
+        except Exception as e:
+            logger.error(f"Redis EXPIRE error for key {key}: {e}")
+            return False
+
+    async def ttl(self, key: str) -> int:
+        """Get TTL for key"""
+        try:
+            return await self.redis_client.ttl(key)
+        except Exception as e:
+            logger.error(f"Redis TTL error for key {key}: {e}")
+            return -1
+
+    # Hash Operations
+    async def hset(self, name: str, mapping: Dict[str, Any]) -> int:
+        """Set hash fields"""
+        try:
+            serialized_mapping = {k: self._encode(v) for k, v in mapping.items()}
+            return await self.redis_client.hset(name, mapping=serialized_mapping)
+        except Exception as e:
+            logger.error(f"Redis HSET error for hash {name}: {e}")
+            return 0
+
+    async def hget(self, name: str, key: str, default: Any = None) -> Any:
+        """Get hash field value"""
+        try:
+            value = await self.redis_client.hget(name, key)
+            if value is None:
+                return default
+            return self._decode(value)
+        except Exception as e:
+            logger.error(f"Redis HGET error for hash {name}, key {key}: {e}")
+            return default
+
+    async def hgetall(self, name: str) -> Dict[str, Any]:
+        """Get all hash fields and values"""
+        try:
+            data = await self.redis_client.hgetall(name)
+            return {_text(k): self._decode(v) for k, v in data.items()}
+        except Exception as e:
+            logger.error(f"Redis HGETALL error for hash {name}: {e}")
+            return {}
+
+    async def hdel(self, name: str, *keys: str) -> int:
+        """Delete hash fields"""
+        try:
+            return await self.redis_client.hdel(name, *keys)
+        except Exception as e:
+            logger.error(f"Redis HDEL error for hash {name}: {e}")
+            return 0
+
+    async def hexists(self, name: str, key: str) -> bool:
+        """Check if hash field exists"""
+        try:
+            return bool(await self.redis_client.hexists(name, key))
+        except Exception as e:
+            logger.error(f"Redis HEXISTS error for hash {name}, key {key}: {e}")
+            return False
+
+    # List Operations
+    async def lpush(self, name: str, *values: Any) -> int:
+        """Push values to left of list"""
+        try:
+            return await self.redis_client.lpush(
+                name, *[self._encode(v) for v in values]
+            )
+        except Exception as e:
+            logger.error(f"Redis LPUSH error for list {name}: {e}")
+            return 0
+
+    async def rpush(self, name: str, *values: Any) -> int:
+        """Push values to right of list"""
+        try:
+            return await self.redis_client.rpush(
+                name, *[self._encode(v) for v in values]
+            )
+        except Exception as e:
+            logger.error(f"Redis RPUSH error for list {name}: {e}")
+            return 0
+
+    async def lpop(self, name: str) -> Any:
+        """Pop value from left of list"""
+        try:
+            value = await self.redis_client.lpop(name)
+            if value is None:
+                return None
+            return self._decode(value)
+        except Exception as e:
+            logger.error(f"Redis LPOP error for list {name}: {e}")
+            return None
+
+    async def rpop(self, name: str) -> Any:
+        """Pop value from right of list"""
+        try:
+            value = await self.redis_client.rpop(name)
+            if value is None:
+                return None
+            return self._decode(value)
+        except Exception as e:
+            logger.error(f"Redis RPOP error for list {name}: {e}")
+            return None
+
+    async def lrange(self, name: str, start: int = 0, end: int = -1) -> List[Any]:
+        """Get list range"""
+        try:
+            values = await self.redis_client.lrange(name, start, end)
+            return [self._decode(v) for v in values]
+        except Exception as e:
+            logger.error(f"Redis LRANGE error for list {name}: {e}")
+            return []
+
+    async def llen(self, name: str) -> int:
+        """Get list length"""
+        try:
+            return await self.redis_client.llen(name)
+        except Exception as e:
+            logger.error(f"Redis LLEN error for list {name}: {e}")
+            return 0
+
+    # Set Operations
+    async def sadd(self, name: str, *values: Any) -> int:
+        """Add values to set"""
+        try:
+            return await self.redis_client.sadd(
+                name, *[self._encode(v) for v in values]
+            )
+        except Exception as e:
+            logger.error(f"Redis SADD error for set {name}: {e}")
+            return 0
+
+    async def srem(self, name: str, *values: Any) -> int:
+        """Remove values from set"""
+        try:
+            return await self.redis_client.srem(
+                name, *[self._encode(v) for v in values]
+            )
+        except Exception as e:
+            logger.error(f"Redis SREM error for set {name}: {e}")
+            return 0
+
+    async def smembers(self, name: str) -> set:
+        """Get all set members"""
+        try:
+            values = await self.redis_client.smembers(name)
+            return {self._decode(v) for v in values}
+        except Exception as e:
+            logger.error(f"Redis SMEMBERS error for set {name}: {e}")
+            return set()
+
+    async def sismember(self, name: str, value: Any) -> bool:
+        """Check if value is in set"""
+        try:
+            return bool(await self.redis_client.sismember(name, self._encode(value)))
+        except Exception as e:
+            logger.error(f"Redis SISMEMBER error for set {name}: {e}")
+            return False
+
+    # Inventory Operations
+    async def set_inventory(
+        self,
+        event_id: Any,
+        counts: Dict[Any, int],
+        ttl: Optional[int] = None,
+        replace: bool = True,
+        limits: Optional[Dict[Any, int]] = None,
+    ) -> bool:
+        """Store remaining stock for an event's ticket types (see RedisClient)"""
+        key = inventory_key(event_id)
+        limits_key = inventory_limits_key(event_id)
+        try:
+            pipe = self.redis_client.pipeline(transaction=True)
+            if replace:
+                pipe.delete(key, limits_key)
+            if counts:
+                pipe.hset(key, mapping={str(k): int(v) for k, v in counts.items()})
+            if limits:
+                pipe.hset(
+                    limits_key, mapping={str(k): int(v) for k, v in limits.items()}
+                )
+            if ttl:
+                pipe.expire(key, ttl)
+                pipe.expire(limits_key, ttl)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis inventory SET error for event {event_id}: {e}")
+            return False
+
+    async def seed_inventory(
+        self,
+        event_id: Any,
+        counts: Dict[Any, int],
+        limits: Optional[Dict[Any, int]] = None,
+    ) -> bool:
+        """Add counters for ticket types that are not tracked yet (see RedisClient)"""
+        try:
+            pipe = self.redis_client.pipeline(transaction=True)
+            for ticket_type_id, count in counts.items():
+                pipe.hsetnx(inventory_key(event_id), str(ticket_type_id), int(count))
+            for ticket_type_id, limit in (limits or {}).items():
+                pipe.hsetnx(
+                    inventory_limits_key(event_id), str(ticket_type_id), int(limit)
+                )
+            await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis inventory SEED error for event {event_id}: {e}")
+            return False
+
+    async def get_inventory(self, event_id: Any) -> Dict[str, int]:
+        """Get remaining stock keyed by ticket type id in a single HGETALL"""
+        key = inventory_key(event_id)
+        try:
+            data = await self.redis_client.hgetall(key)
+            return {_text(k): int(v) for k, v in data.items()}
+        except Exception as e:
+            logger.error(f"Redis inventory GET error for event {event_id}: {e}")
+            return {}
+
+    async def adjust_inventory(
+        self, event_id: Any, ticket_type_id: Any, amount: int
+    ) -> Optional[int]:
+        """Add amount (negative to remove) to a ticket type's remaining stock"""
+        key = inventory_key(event_id)
+        try:
+            return await self.redis_client.hincrby(key, str(ticket_type_id), amount)
+        except Exception as e:
+            logger.error(
+                f"Redis inventory HINCRBY error for event {event_id}, "
+                f"ticket type {ticket_type_id}: {e}"
+            )
+            return None
+
+    async def delete_inventory(self, event_id: Any) -> bool:
+        """Delete all stock counters of an event"""
+        return bool(
+            await self.delete(inventory_key(event_id), inventory_limits_key(event_id))
+        )
+
+    async def reserve(
+        self, event_id: Any, quantities: Dict[Any, int], user_id: Any
+    ) -> Dict[str, Any]:
+        """Atomically take stock for several ticket types (see RedisClient.reserve)"""
+        args, invalid = RedisClient._reservation_args(quantities)
+        if invalid is not None or not args:
+            return {
+                "success": False,
+                "reason": "invalid_quantity",
+                "ticket_type": None if invalid is None else str(invalid),
+                "available": 0,
+            }
+
+        try:
+            result = await self._run_script(
+                redis_scripts.RESERVE,
+                keys=[
+                    inventory_key(event_id),
+                    inventory_limits_key(event_id),
+                    inventory_holds_key(event_id, user_id),
+                ],
+                args=args,
+            )
+        except Exception as e:
+            logger.error(f"Redis RESERVE error for event {event_id}: {e}")
+            return {"success": False, "reason": "unavailable"}
+
+        if result[0] == 1:
+            return {"success": True}
+        return {
+            "success": False,
+            "reason": _text(result[1]),
+            "ticket_type": _text(result[2]),
+            "available": int(result[3]),
+        }
+
+    async def release(
+        self, event_id: Any, quantities: Dict[Any, int], user_id: Any
+    ) -> bool:
+        """Give back stock taken by reserve() (see RedisClient.release)"""
+        args, invalid = RedisClient._reservation_args(quantities)
+        if invalid is not None:
+            logger.error(
+                f"Redis RELEASE for event {event_id} rejected: invalid quantity "
+                f"for ticket type {invalid}"
+            )
+            return False
+        if not args:
+            return True
+
+        try:
+            released = await self._run_script(
+                redis_scripts.RELEASE,
+                keys=[
+                    inventory_key(event_id),
+                    inventory_limits_key(event_id),
+                    inventory_holds_key(event_id, user_id),
+                ],
+                args=args,
+            )
+            return released >= 0
+        except Exception as e:
+            logger.error(f"Redis RELEASE error for event {event_id}: {e}")
+            return False
+
+    # Cache Operations
+    async def _publish_invalidation(self, key: str):
+        """
+        Drop the local copies of key in this process and, through the
+        invalidation channel, in every other worker
+        """
+        if int(_setting("REDIS_LOCAL_CACHE_SIZE", 1024)) <= 0:
+            return
+        self.sync_client.evict_local(key)
+        try:
+            await self.redis_client.publish(
+                CACHE_INVALIDATION_CHANNEL, f"{self._origin}:{key}"
+            )
+        except Exception as e:
+            logger.error(f"Redis PUBLISH error for key {key}: {e}")
+
+    async def cache_set(self, key: str, value: Any, timeout: int = 3600) -> bool:
+        """Cache a value with timeout (default 1 hour)"""
+        full_key = cache_key(key)
+        stored = await self.set(full_key, value, timeout)
+        if stored:
+            await self._publish_invalidation(full_key)
+        return stored
+
+    async def cache_get(self, key: str, default: Any = None) -> Any:
+        """Get cached value"""
+        value = await self.get(cache_key(key))
+        return default if value is None else unwrap_cached(value)
+
+    async def cache_delete(self, key: str) -> bool:
+        """Delete cached value here, in Redis and in every other worker"""
+        full_key = cache_key(key)
+        deleted = bool(await self.delete(full_key))
+        await self._publish_invalidation(full_key)
+        return deleted
+
+    async def cache_get_or_set(
+        self,
+        key: str,
+        callable_func: Callable[[], Union[Any, Awaitable[Any]]],
+        timeout: int = 3600,
+    ) -> Any:
+        """Get from cache or set if not exists; callable_func may be async"""
+        cached_value = await self.cache_get(key)
+
+        if cached_value is not None:
+            return cached_value
+
+        # Get fresh value
+        fresh_value = callable_func()
+        if asyncio.iscoroutine(fresh_value):
+            fresh_value = await fresh_value
+        await self.cache_set(key, fresh_value, timeout)
+        return fresh_value
+
+    # Session Operations
+    async def set_session(
+        self, session_id: str, user_id: int, data: Dict[str, Any], ttl: int = 86400
+    ) -> bool:
+        """Set user session data (default 24 hours)"""
+        session_data = {
+            "user_id": user_id,
+            "data": data,
+            "created_at": json.dumps(timezone.now(), cls=DjangoJSONEncoder),
+        }
+        return await self.set(session_key(session_id), session_data, ttl)
+
+    async def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get user session data"""
+        return await self.get(session_key(session_id))
+
+    async def delete_session(self, session_id: str) -> bool:
+        """Delete user session"""
+        return bool(await self.delete(session_key(session_id)))
+
+    # Rate Limiting
+    async def rate_limit_check(
+        self, identifier: str, limit: int, window: int, cost: int = 1
+    ) -> Dict[str, Any]:
+        """Check rate limit for identifier (see RedisClient.rate_limit_check)"""
+        key = rate_limit_key(identifier)
+        now = time.time()
+
+        try:
+            allowed, remaining, retry_after, reset_after = await self._run_script(
+                redis_scripts.GCRA, [key], [limit, window, cost]
+            )
+            return {
+                "allowed": bool(allowed),
+                "remaining": remaining,
+                "retry_after": retry_after / 1000,
+                "reset_time": int(now + reset_after / 1000),
+            }
+
+        except Exception as e:
+            logger.error(f"Rate limit check error for {identifier}: {e}")
+            return {
+                "allowed": True,
+                "remaining": limit,
+                "retry_after": 0,
+                "reset_time": int(now),
+            }
+
+    async def flush_all(self) -> bool:
+        """Flush all Redis data (use with caution!)"""
+        try:
+            return await self.redis_client.flushall()
+        except Exception as e:
+            logger.error(f"Redis FLUSHALL error: {e}")
+            return False
+
+    async def scan_iter(
+        self, pattern: str = "*", count: int = 500
+    ) -> AsyncIterator[str]:
+        """Iterate over keys matching pattern using SCAN cursors"""
+        try:
+            async for key in self.redis_client.scan_iter(match=pattern, count=count):
+                yield _text(key)
+        except Exception as e:
+            logger.error(f"Redis SCAN error for pattern {pattern}: {e}")
+
+    async def get_keys(self, pattern: str = "*") -> List[str]:
+        """Get keys matching pattern (SCAN based, see scan_iter)"""
+        return list(dict.fromkeys([key async for key in self.scan_iter(pattern)]))
+
+    async def get_info(self) -> Dict[str, Any]:
+        """Get Redis server info"""
+        try:
+            return await self.redis_client.info()
+        except Exception as e:
+            logger.error(f"Redis INFO error: {e}")
+            return {}
+
+
+# Global instance
+async_redis_client = AsyncRedisClient()